@@ -1,10 +1,56 @@
 # Importação das bibliotecas utilizadas
-from dash import dcc, html, Input, Output, State, Dash, dash_table
+from dash import dcc, html, Input, Output, State, Dash, Patch, dash_table
 from dash.exceptions import PreventUpdate
+from dash.dash_table.Format import Format, Scheme, Symbol
 import dash
 import plotly.express as px
 import pandas as pd
 import plotly.graph_objs as go
+import plotly.io as pio
+import numpy as np
+from itertools import product, count
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import functools
+import importlib.util
+import multiprocessing
+import threading
+import sys
+import os
+import json
+import hashlib
+import logging
+import time
+import flask
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge,
+                               Histogram, generate_latest, multiprocess)
+
+try:  # O cache colunar dos dados depende do pyarrow; sem ele o CSV é sempre lido
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+try:  # Os callbacks em segundo plano dependem do diskcache, multiprocess e psutil (dash[diskcache])
+    import diskcache
+    import psutil  # noqa: F401 (usado pelo DiskcacheManager para encerrar os processos)
+    # O multiprocess (usado pelo DiskcacheManager para criar os processos) só é procurado:
+    # importado, o seu nome substituiria o multiprocess do prometheus_client
+    if importlib.util.find_spec("multiprocess") is None:
+        raise ImportError("multiprocess")
+except ImportError:
+    diskcache = None
+
+# Serialização com o orjson (DASH_JSON_ENGINE). O plotly também o importa sob demanda na
+# primeira resposta, e threads de requisições simultâneas poderiam receber o módulo ainda
+# parcialmente inicializado: a importação é feita aqui, uma única vez
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 bank_colors = {  # Dicionario de cores para os principais Bancos
     "BB": "#F9DD16",
@@ -15,13 +61,146 @@ bank_colors = {  # Dicionario de cores para os principais Bancos
     "MERCADO": "#06548a",
 }
 
+# Nome do tema (template do plotly) usado por todos os gráficos do dashboard
+FIGURE_TEMPLATE = "bb"
+
+# Layout comum aos gráficos, aplicado pelo tema (cada gráfico define apenas o que tem de próprio)
+TEMPLATE_LAYOUT = dict(
+    height=480,  # Altura da figura
+    paper_bgcolor="white",  # Cor de fundo da figura
+    font=dict(
+        family="BancoDoBrasil Textos",  # Fonte do texto
+        color='#002D4B',  # Cor do texto
+    ),
+    hoverlabel=dict(  # Caixa de texto que aparece ao passar o mouse
+        bordercolor='#002D4B',  # Cor da borda da caixa
+        font=dict(
+            color='#002D4B',  # Cor do texto
+            size=12,  # Tamanho do texto
+            family="BancoDoBrasil Textos",  # Fonte do texto
+        ),
+        bgcolor="white",  # Cor de fundo da caixa
+    ),
+    title=dict(  # Título do gráfico
+        font=dict(
+            size=20,  # Tamanho da fonte
+            color="#0D214F",  # Cor do texto
+            family="BancoDoBrasil Textos",  # Fonte do texto
+        ),
+        x=0.5,  # Posição do título no eixo X
+        y=0.95,  # Posição do título no eixo Y
+    ),
+    xaxis=dict(  # Títulos dos eixos X
+        title=dict(font=dict(size=16, color="#0D214F", family="BancoDoBrasil Textos")),
+    ),
+    yaxis=dict(  # Títulos dos eixos Y
+        title=dict(font=dict(size=16, color="#0D214F", family="BancoDoBrasil Textos")),
+    ),
+    legend=dict(  # Legenda à direita do gráfico
+        bgcolor="rgba(0,0,0,0)",  # Cor de fundo da legenda
+        yanchor="top",  # Âncora da legenda no eixo Y
+        y=0.99,  # Posição da legenda no eixo Y
+        xanchor="left",  # Âncora da legenda no eixo X
+        x=1,  # Posição da legenda no eixo X
+        font=dict(size=11, color="#0D214F", family="BancoDoBrasil Textos"),  # Texto da legenda
+        title=dict(  # Título da legenda
+            font=dict(size=13, color="#0D214F", family="BancoDoBrasil Textos"),
+        ),
+    ),
+    transition_duration=1000,  # Tempo de transição na atualização do gráfico
+)
+
+# Estilo padrão de cada tipo de traço usado nos gráficos
+TEMPLATE_TRACES = {
+    "scatter": dict(line=dict(width=1.8), textposition="bottom right"),
+    "scattergl": dict(line=dict(width=1.8), textposition="bottom right"),
+    "bar": dict(textfont=dict(family="BancoDoBrasil Textos", color="white")),
+    "pie": dict(textposition="inside", textinfo="percent+label"),
+}
+
+
+def build_template():
+    """
+    Tema dos gráficos: o tema "plotly" (apenas com os tipos de traço usados no dashboard, o que
+    também reduz a validação feita a cada figura) com o layout e os traços acima
+    """
+    base = pio.templates["plotly"]
+    template = go.layout.Template(layout=base.layout)
+    for kind, style in TEMPLATE_TRACES.items():
+        template.data[kind] = [trace.update(style) for trace in base.data[kind]]
+    template.layout.update(TEMPLATE_LAYOUT)
+    return template
+
+
+# Registrado uma única vez; os gráficos usam template=FIGURE_TEMPLATE
+pio.templates[FIGURE_TEMPLATE] = build_template()
+
+# Serialização das figuras e das respostas dos callbacks: "plotly" (os codificadores padrão do
+# plotly e do Dash) ou "orjson" (arrays do numpy e datas codificados pelo orjson, sem conversão
+# prévia para listas; as figuras em cache também são lidas pelo orjson)
+JSON_ENGINES = ("plotly", "orjson")
+JSON_ENGINE = os.environ.get("DASH_JSON_ENGINE", "plotly")
+if JSON_ENGINE not in JSON_ENGINES:
+    raise ValueError(f"DASH_JSON_ENGINE inválido: {JSON_ENGINE!r} (use {', '.join(JSON_ENGINES)})")
+if JSON_ENGINE == "orjson":
+    if orjson is None:
+        raise ValueError("DASH_JSON_ENGINE=orjson requer o pacote orjson")
+    # Usado pelo to_json das figuras e pelo Dash na resposta de cada callback
+    pio.json.config.default_engine = "orjson"
+    json_loads = orjson.loads
+else:
+    json_loads = json.loads
+
+
+def encode_patch(patch):
+    """
+    Patch pronto para a serialização: com o orjson, as operações do Patch em um dicionário (o
+    mesmo enviado ao navegador); um objeto Patch na resposta faria o plotly converter toda a
+    resposta, valor por valor, antes de codificá-la
+    """
+    if JSON_ENGINE == "orjson":
+        return patch.to_plotly_json()
+    return patch
+
+# Colunas originais do CSV do IF.data
+RAW_COLUMNS = ["NOME_BANCO", "ANO", "TRIMESTRE", "NUMERO_OP", "VOLUME_OP",
+               "NUMERO_INTERBANK", "VOLUME_INTERBANK", "RESULT_OP", "DESPESA_OP"]
+
+# Tipos das colunas do dataset em memória: "category" para os rótulos de banco e período,
+# "integer" e "float" para o menor tipo numérico que representa todos os valores sem perda
+SCHEMA = {
+    "NOME_BANCO": "category",
+    "ANO": "integer",
+    "TRIMESTRE": "category",
+    "NUMERO_OP": "integer",
+    "VOLUME_OP": "integer",
+    "NUMERO_INTERBANK": "integer",
+    "VOLUME_INTERBANK": "integer",
+    "RESULT_OP": "integer",
+    "DESPESA_OP": "integer",
+    "TOTAL_VOL": "integer",
+    "TOTAL_OP": "integer",
+    "TOTAL_N": "integer",
+    "SPREAD": "float",
+}
+
+# Colunas categóricas do dataset
+CATEGORY_COLUMNS = [col for col, kind in SCHEMA.items() if kind == "category"]
+
+
 def read_csv(csv_file_path):
     """
     Carrega um dataFrame e faz alterações nas colunas
     """
-    # Carrega o dataframe a partir do arquivo CSV
-    df = pd.read_csv(csv_file_path)
+    # Carrega o dataframe a partir do arquivo CSV (os nomes dos bancos já como categorias)
+    return prepare_data(pd.read_csv(csv_file_path, dtype={"NOME_BANCO": "category"}))
 
+
+def prepare_data(df):
+    """
+    Cria as colunas derivadas a partir das colunas originais do CSV
+    (usado tanto na carga completa quanto nas linhas de um novo trimestre)
+    """
     # Cria o dicionário de substituições para o trimestre
     quarter_replace = {1: "03", 2: "06", 3: "09", 4: "12"}
 
@@ -29,11 +208,9 @@ def read_csv(csv_file_path):
     df["TRIMESTRE"] = df["TRIMESTRE"].replace(quarter_replace)
 
     # Concatena o ano e o trimestre em uma coluna
+    # (o texto "AAAA-MM" exibido no DataTable é formatado a partir dela, ver data_table)
     df["ANO-TRIMESTRE"] = df["ANO"].astype(str) + "-" + df["TRIMESTRE"]
 
-    # Para visualização no DataTable
-    df['ANO_TRIMESTRE'] = df["ANO"].astype(str) + "-" + df["TRIMESTRE"]
-
     # Formata os valores da coluna ANO-TRIMESTRE para o tipo Date
     df["ANO-TRIMESTRE"] = pd.to_datetime(df["ANO-TRIMESTRE"], format="%Y-%m")
 
@@ -52,31 +229,942 @@ def read_csv(csv_file_path):
         (df["RESULT_OP"] + df["DESPESA_OP"]) / 100
     df["SPREAD"] = df["SPREAD"].round(decimals=2)
 
+    # Converte as colunas para os tipos compactos do SCHEMA
+    return compact_dtypes(df)
+
+
+def compact_dtypes(df):
+    """
+    Converte as colunas de df (no próprio df) para os tipos do SCHEMA: categorias para os
+    rótulos e o menor tipo inteiro ou decimal que guarda os mesmos valores
+    """
+    for col, kind in SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if kind == "category":
+            df[col] = df[col].astype("category")
+            continue
+
+        # Inteiros: menor tipo com sinal que comporta todos os valores
+        values = pd.to_numeric(df[col], downcast="integer" if kind == "integer" else None)
+
+        # Decimais: float32 apenas se todos os valores forem representados exatamente
+        if pd.api.types.is_float_dtype(values) and values.dtype != np.float32:
+            narrow = values.to_numpy(dtype=np.float32)
+            if np.array_equal(narrow, values.to_numpy(), equal_nan=True):
+                values = pd.Series(narrow, index=values.index, name=col)
+        df[col] = values
+    return df
+
+
+def concat_data(df, new_df):
+    """
+    Concatena dois dataFrames com os tipos do SCHEMA
+    As colunas categóricas do resultado têm a união das categorias dos dois
+    """
+    combined = pd.concat([df, new_df], ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        combined[col] = pd.api.types.union_categoricals(
+            [df[col], new_df[col]], sort_categories=True)
+    return combined
+
+
+# Versão do formato do cache colunar (deve ser incrementada sempre que o read_csv mudar)
+CACHE_FORMAT_VERSION = 2
+
+
+def file_hash(file_path, chunk_size=1024 * 1024):
+    """Hash SHA-256 do conteúdo de um arquivo"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_dataset(csv_file_path):
+    """
+    Carrega o dataFrame do read_csv a partir de um cache colunar (Feather) gravado ao lado do CSV
+
+    O cache é válido enquanto a data de modificação e o tamanho do CSV forem os mesmos ou,
+    se a data mudou, enquanto o hash do conteúdo for o mesmo. Caso contrário o CSV é lido
+    novamente e o cache é regravado. O arquivo Feather é gravado sem compressão e lido
+    mapeado em memória, compartilhando as páginas entre os processos pelo cache do sistema
+    Se o cache não puder ser gravado (ex.: diretório somente leitura ou disco cheio), o
+    dataFrame lido do CSV é usado sem ele
+    """
+    # Sem pyarrow, lê o CSV diretamente
+    if feather is None:
+        return read_csv(csv_file_path)
+
+    cache_file_path = os.path.splitext(csv_file_path)[0] + ".feather"
+    meta_file_path = cache_file_path + ".json"
+    stat = os.stat(csv_file_path)
+
+    # Metadados do cache: versão do formato, data de modificação, tamanho e hash do CSV
+    try:
+        with open(meta_file_path) as meta_file:
+            meta = json.load(meta_file)
+    except (OSError, ValueError):
+        meta = {}
+
+    valid = (meta.get("format") == CACHE_FORMAT_VERSION
+             and meta.get("size") == stat.st_size
+             and os.path.exists(cache_file_path))
+    if valid and meta.get("mtime_ns") != stat.st_mtime_ns:
+        # Data de modificação diferente: o cache só vale se o conteúdo for o mesmo
+        csv_hash = file_hash(csv_file_path)
+        valid = meta.get("sha256") == csv_hash
+        if valid:
+            meta["mtime_ns"] = stat.st_mtime_ns
+            try:
+                write_json_atomic(meta_file_path, meta)
+            except OSError as error:  # O hash é calculado de novo na próxima leitura
+                logger.warning("Metadados do cache %s não atualizados: %s",
+                               meta_file_path, error)
+
+    if valid:
+        try:
+            # Leitura mapeada em memória; split_blocks evita cópias ao montar o dataFrame
+            return feather.read_table(cache_file_path, memory_map=True)\
+                .to_pandas(split_blocks=True)
+        except Exception:  # Cache corrompido: lê o CSV novamente
+            pass
+
+    df = read_csv(csv_file_path)
+
+    # Grava o cache em um arquivo temporário e o substitui de forma atômica
+    tmp_file_path = f"{cache_file_path}.{os.getpid()}.tmp"
+    try:
+        feather.write_feather(df, tmp_file_path, compression="uncompressed")
+        os.replace(tmp_file_path, cache_file_path)
+        write_json_atomic(meta_file_path, {
+            "format": CACHE_FORMAT_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": file_hash(csv_file_path),
+        })
+    except OSError as error:
+        logger.warning("Cache %s não gravado; usando o CSV lido: %s", cache_file_path, error)
+        try:
+            os.remove(tmp_file_path)
+        except OSError:
+            pass
     return df
 
 
-# Carregar o arquivo csv chamado "spread.csv" na variável df
-df = read_csv("data/spread.csv")
+def write_json_atomic(file_path, data):
+    """Grava um arquivo JSON substituindo o anterior de forma atômica"""
+    tmp_file_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_file_path, "w") as file:
+        json.dump(data, file)
+    os.replace(tmp_file_path, file_path)
+
+
+# Colunas usadas pelos filtros do dashboard
+FILTER_COLUMNS = ["ANO", "TRIMESTRE", "NOME_BANCO"]
+
+
+class FilterIndex:
+    """
+    Índice de filtragem do dataFrame, criado uma única vez na carga dos dados
+
+    Guarda os códigos categóricos de cada coluna filtrada e a lista de posições
+    das linhas de cada combinação (ANO, TRIMESTRE, NOME_BANCO)
+    """
+
+    # Acima dessa proporção de combinações por linha, os códigos categóricos são mais rápidos
+    MAX_KEYS_PER_ROW = 0.05
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+
+        # Posições das linhas de cada combinação de ano, trimestre e banco
+        self.groups = df.groupby(FILTER_COLUMNS, sort=False, observed=True).indices
+
+        # Códigos inteiros e valores únicos (sem categorias) de cada coluna filtrada
+        self.codes = {}
+        for col in FILTER_COLUMNS:
+            codes, uniques = pd.factorize(df[col])
+            self.codes[col] = (codes, pd.Index(np.asarray(uniques)))
+
+    def extend(self, new_df):
+        """
+        Novo índice com as linhas de new_df adicionadas ao final do dataFrame indexado
+        O índice atual não é alterado
+        """
+        extended = FilterIndex.__new__(FilterIndex)
+        extended.n_rows = self.n_rows + len(new_df)
+
+        # Posições das novas combinações, deslocadas para depois das linhas atuais
+        extended.groups = dict(self.groups)
+        for key, positions in new_df.groupby(FILTER_COLUMNS, sort=False,
+                                             observed=True).indices.items():
+            positions = positions + self.n_rows
+            if key in extended.groups:
+                positions = np.concatenate([extended.groups[key], positions])
+            extended.groups[key] = positions
+
+        # Acrescenta os valores novos aos valores únicos e os códigos das novas linhas
+        extended.codes = {}
+        for col in FILTER_COLUMNS:
+            codes, uniques = self.codes[col]
+            values = pd.Index(np.asarray(new_df[col].unique()))
+            uniques = uniques.append(values[~values.isin(uniques)])
+            extended.codes[col] = (
+                np.concatenate([codes, uniques.get_indexer(np.asarray(new_df[col]))]), uniques)
+        return extended
+
+    def positions(self, selected_year, selected_quarter, selected_bank):
+        """Retorna as posições ordenadas das linhas que atendem à seleção"""
+        # dict.fromkeys remove valores repetidos mantendo a ordem
+        selections = [list(dict.fromkeys(values)) for values in
+                      (selected_year, selected_quarter, selected_bank)]
+        n_keys = np.prod([len(values) for values in selections])
+
+        if n_keys <= self.n_rows * self.MAX_KEYS_PER_ROW:
+            # Poucas combinações: junta as listas de posições de cada uma
+            offsets = [self.groups[key] for key in product(*selections)
+                       if key in self.groups]
+            if not offsets:
+                return np.empty(0, dtype=np.intp)
+            # Ordena para manter a mesma ordem de linhas do dataframe original
+            return np.sort(np.concatenate(offsets))
+
+        # Muitas combinações: tabela de consulta por código categórico em cada coluna
+        mask = np.ones(self.n_rows, dtype=bool)
+        for col, values in zip(FILTER_COLUMNS, selections):
+            codes, uniques = self.codes[col]
+            mask &= uniques.isin(values)[codes]
+        return np.flatnonzero(mask)
+
+
+# Medidas somadas no cubo de agregados
+CUBE_MEASURES = ["TOTAL_VOL", "TOTAL_N", "TOTAL_OP"]
+
+
+class Cube:
+    """
+    Cubo de agregados banco × ano × trimestre com as somas de CUBE_MEASURES,
+    materializado uma única vez na carga dos dados
+
+    Os totais do mercado e a participação de cada banco em uma seleção são obtidos
+    somando fatias do cubo, sem agrupar as linhas originais a cada requisição
+    """
+
+    def __init__(self, df):
+        # Eixos do cubo em ordem crescente (mesma ordem dos groupby do pandas)
+        # As somas usam ao menos 64 bits, mesmo com as colunas em tipos compactos
+        self._set_axes(self._axis(df["NOME_BANCO"]),
+                       self._axis(df["ANO"]),
+                       self._axis(df["TRIMESTRE"]),
+                       np.promote_types(df[CUBE_MEASURES].to_numpy().dtype, np.int64))
+        self._add(df)
+
+    @staticmethod
+    def _axis(values):
+        """Valores únicos (sem categorias) de uma coluna, em ordem crescente"""
+        return pd.Index(np.sort(np.asarray(values.unique())))
+
+    def _set_axes(self, banks, years, quarters, dtype):
+        self.banks = banks
+        self.years = years
+        self.quarters = quarters
+        shape = (len(banks), len(years), len(quarters))
+
+        # Somas das medidas e presença de cada combinação nos dados
+        self.values = np.zeros(shape + (len(CUBE_MEASURES),), dtype=dtype)
+        self.present = np.zeros(shape, dtype=bool)
+
+        # Data (ANO-TRIMESTRE) de cada combinação de ano e trimestre
+        self.dates = pd.to_datetime(
+            [f"{year}-{quarter}" for year in years for quarter in quarters],
+            format="%Y-%m",
+        ).to_numpy().reshape(len(years), len(quarters))
+
+    def _add(self, df):
+        """Soma as linhas de df nas células do cubo"""
+        cells = (self.banks.get_indexer(np.asarray(df["NOME_BANCO"])),
+                 self.years.get_indexer(np.asarray(df["ANO"])),
+                 self.quarters.get_indexer(np.asarray(df["TRIMESTRE"])))
+        np.add.at(self.values, cells, df[CUBE_MEASURES].to_numpy())
+        self.present[cells] = True
+
+    def extend(self, new_df):
+        """
+        Novo cubo com as linhas de new_df somadas (o cubo atual não é alterado)
+        Os eixos ganham os bancos, anos e trimestres que ainda não existiam
+        """
+        def union(axis, values):
+            return pd.Index(np.sort(axis.union(Cube._axis(values))))
+
+        extended = Cube.__new__(Cube)
+        extended._set_axes(union(self.banks, new_df["NOME_BANCO"]),
+                           union(self.years, new_df["ANO"]),
+                           union(self.quarters, new_df["TRIMESTRE"]),
+                           np.result_type(self.values, new_df[CUBE_MEASURES].to_numpy()))
+
+        # Copia as células atuais para as suas posições nos novos eixos
+        cells = np.ix_(extended.banks.get_indexer(self.banks),
+                       extended.years.get_indexer(self.years),
+                       extended.quarters.get_indexer(self.quarters))
+        extended.values[cells] = self.values
+        extended.present[cells] = self.present
+
+        extended._add(new_df)
+        return extended
+
+    def _cells(self, selection):
+        """Fatia do cubo (índices de bancos, anos e trimestres) de uma seleção normalizada"""
+        selected_year, selected_quarter, selected_bank = selection
+
+        def positions(axis, values):
+            positions = axis.get_indexer(pd.Index(values))
+            return np.sort(positions[positions >= 0])
+
+        return np.ix_(positions(self.banks, selected_bank),
+                      positions(self.years, selected_year),
+                      positions(self.quarters, selected_quarter))
+
+    def market_totals(self, selection):
+        """
+        Soma das medidas dos bancos selecionados por trimestre e ano (ANO-TRIMESTRE),
+        apenas para os trimestres com dados, em ordem cronológica
+        """
+        cells = self._cells(selection)
+        values = self.values[cells].sum(axis=0)
+        present = self.present[cells].any(axis=0)
+        dates = self.dates[cells[1][0], cells[2][0]]
+
+        market = pd.DataFrame(values[present], columns=CUBE_MEASURES)
+        market.insert(0, "ANO-TRIMESTRE", dates[present])
+        return market.sort_values("ANO-TRIMESTRE", kind="mergesort", ignore_index=True)
+
+    def bank_totals(self, selection, measure="TOTAL_N"):
+        """Soma de uma medida por banco selecionado (bancos sem dados na seleção ficam de fora)"""
+        cells = self._cells(selection)
+        values = self.values[cells][..., CUBE_MEASURES.index(measure)].sum(axis=(1, 2))
+        present = self.present[cells].any(axis=(1, 2))
+        banks = self.banks[cells[0][:, 0, 0]]
+        return pd.Series(values[present], index=banks[present].rename("NOME_BANCO"), name=measure)
+
+    def bank_rows(self, selection, bank):
+        """Linhas (ANO-TRIMESTRE e medidas) de um banco na seleção, em ordem cronológica"""
+        _, years, quarters = self._cells(selection)
+        if bank not in selection[2] or bank not in self.banks:
+            # Sem o banco na seleção, nenhuma célula é usada (mantendo os tipos das colunas)
+            present = np.zeros(self.dates[years, quarters].shape, dtype=bool)
+            position = 0
+        else:
+            position = self.banks.get_loc(bank)
+            present = self.present[position][years, quarters]
+        values = self.values[position][years, quarters]
+        dates = self.dates[years, quarters]
+
+        rows = pd.DataFrame(values[present], columns=CUBE_MEASURES)
+        rows.insert(0, "ANO-TRIMESTRE", dates[present])
+        rows.insert(0, "NOME_BANCO", bank)
+        return rows.sort_values("ANO-TRIMESTRE", kind="mergesort", ignore_index=True)
+
+
+class LRUCache:
+    """
+    Cache LRU compartilhado entre as threads do processo, limitado pelo tamanho em bytes
+
+    Cada chave é calculada uma única vez: threads que pedirem a mesma chave enquanto
+    ela está sendo calculada esperam pelo resultado em vez de recalcular
+    """
+
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes  # Tamanho máximo ocupado pelos valores
+        self.sizeof = sizeof  # Função que calcula o tamanho de um valor em bytes
+        self.nbytes = 0  # Tamanho ocupado atualmente
+        self.hits = 0  # Quantidade de acertos
+        self.misses = 0  # Quantidade de erros (valores calculados)
+        self._data = OrderedDict()  # chave -> (valor, tamanho), do mais antigo ao mais recente
+        self._pending = {}  # chave -> lock das chaves sendo calculadas
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, factory):
+        """Retorna o valor da chave, calculando-o com factory() se não estiver no cache"""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key][0]
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Outra thread pode ter calculado o valor enquanto esperávamos
+            with self._lock:
+                if key in self._data:
+                    self.hits += 1
+                    self._data.move_to_end(key)
+                    return self._data[key][0]
+                self.misses += 1
+
+            try:
+                value = factory()
+                self._put(key, value)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+        return value
+
+    def _put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            # Valores maiores que o cache inteiro não são guardados
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.nbytes += size
+
+            # Remove os valores usados há mais tempo até caber no limite
+            while self.nbytes > self.max_bytes:
+                _, (_, old_size) = self._data.popitem(last=False)
+                self.nbytes -= old_size
+
+    def __contains__(self, key):
+        """Se a chave está no cache (sem alterar a ordem de uso nem os contadores)"""
+        with self._lock:
+            return key in self._data
+
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)"""
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Contadores de uso do cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._data),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def frame_nbytes(value):
+    """Tamanho em bytes de um dataFrame/série do pandas (ou de outro objeto)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        # Series.memory_usage retorna um inteiro e DataFrame.memory_usage uma série
+        return int(np.sum(value.memory_usage(deep=True)))
+    return sys.getsizeof(value)
+
+
+# Limite de memória do cache de seleções (256 MB por processo)
+SELECTION_CACHE_BYTES = 256 * 1024 * 1024
+
+# Cache dos dados filtrados e agregados, compartilhado entre todos os callbacks
+selection_cache = LRUCache(SELECTION_CACHE_BYTES, frame_nbytes)
+
+
+# Limite de memória do cache de figuras serializadas (64 MB por processo)
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Cache do JSON das figuras, compartilhado entre todos os usuários do processo
+figure_cache = LRUCache(FIGURE_CACHE_BYTES, len)
+
+
+class Dataset:
+    """
+    Dados do dashboard e as estruturas derivadas deles (índice de filtragem, cubo de agregados
+    e valores dos filtros)
+
+    Um Dataset não é alterado depois de criado: cada nova versão dos dados cria um novo
+    objeto, que substitui o anterior de forma atômica (copy-on-write, ver swap_dataset)
+    """
+
+    def __init__(self, df, version, index=None, sources=frozenset(), file_version=None,
+                 cube=None):
+        self.df = df
+        self.version = version  # Versão dos dados, usada nas chaves dos caches
+        self.file_version = file_version or version  # Versão do spread.csv de origem
+        self.index = index if index is not None else FilterIndex(df)
+        self.cube = cube if cube is not None else Cube(df)
+        # Partes incorporadas: arquivos incrementais (nome, data, tamanho) ou, sem arquivo,
+        # linhas incorporadas diretamente (ver rows_source)
+        self.sources = sources
+        # Valores únicos (sem categorias) para os filtros
+        self.years = np.asarray(df["ANO"].unique())  # Anos unicos para o filtro
+        self.banks = np.asarray(df["NOME_BANCO"].unique())  # Bancos unicos para o filtro
+        self.quarters = np.asarray(df["TRIMESTRE"].unique())  # Trimestres unicos para o filtro
+
+    def append(self, new_df, version, source=None):
+        """Novo Dataset com as linhas de new_df (já com as colunas derivadas) no final"""
+        df = concat_data(self.df, new_df)
+        sources = self.sources | {source} if source is not None else self.sources
+        return Dataset(df, version, self.index.extend(new_df), sources, self.file_version,
+                       self.cube.extend(new_df))
+
+
+def dataset_version(csv_file_path):
+    """Versão do arquivo de dados, alterada sempre que o arquivo é modificado"""
+    stat = os.stat(csv_file_path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+# Caminho do arquivo de dados do dashboard
+DATA_PATH = "data/spread.csv"
+
+# Pasta onde novos trimestres podem ser colocados como arquivos CSV no formato do spread.csv
+INCOMING_DIR = "data/incoming"
+
+# Intervalo (em segundos) entre as verificações de novos arquivos de dados
+DATA_POLL_SECONDS = 30
+
+# Trava das substituições do dataset (as leituras não precisam dela)
+dataset_lock = threading.Lock()
+
+# Arquivos incrementais rejeitados na validação (não são lidos de novo enquanto não mudarem)
+rejected_sources = set()
+
+
+def swap_dataset(new_dataset):
+    """Substitui o dataset atual de forma atômica e descarta os caches da versão anterior"""
+    global dataset
+    dataset = new_dataset
+    selection_cache.clear()
+    figure_cache.clear()
+    # A página inicial e as seleções frequentes não esperam pelos novos dados filtrados
+    warm_up(new_dataset)
+    report_memory()
+
+
+def validate_quarter(raw, data):
+    """
+    Valida as linhas de um novo trimestre antes de incorporá-las ao dataset
+    Retorna o dataFrame com as colunas derivadas ou levanta ValueError
+    """
+    # Verifica se todas as colunas do CSV original estão presentes
+    missing = [col for col in RAW_COLUMNS if col not in raw.columns]
+    if missing:
+        raise ValueError(f"colunas ausentes: {', '.join(missing)}")
+    if raw.empty:
+        raise ValueError("nenhuma linha encontrada")
+
+    raw = raw[RAW_COLUMNS].copy()
+
+    # Verifica valores vazios, colunas não numéricas e trimestres inválidos
+    if raw.isna().any().any():
+        raise ValueError("valores vazios")
+    not_numeric = [col for col in RAW_COLUMNS[1:]
+                   if not pd.api.types.is_numeric_dtype(raw[col])]
+    if not_numeric:
+        raise ValueError(f"colunas não numéricas: {', '.join(not_numeric)}")
+    if not raw["TRIMESTRE"].isin([1, 2, 3, 4]).all():
+        raise ValueError("trimestre fora do intervalo de 1 a 4")
+
+    new_df = prepare_data(raw)
+
+    # Cada banco pode aparecer uma única vez por trimestre, no arquivo e no dataset
+    if new_df.duplicated(FILTER_COLUMNS).any():
+        raise ValueError("banco repetido no mesmo trimestre")
+    existing = [key for key in new_df[FILTER_COLUMNS].itertuples(index=False, name=None)
+                if key in data.index.groups]
+    if existing:
+        raise ValueError(f"{len(existing)} linhas já existem no dataset, ex.: {existing[0]}")
+
+    return new_df
+
+
+def rows_source(new_df):
+    """Identificação de linhas incorporadas sem arquivo: ("", hash do conteúdo, linhas)"""
+    values = pd.util.hash_pandas_object(new_df, index=False).to_numpy()
+    return "", hashlib.sha1(values.tobytes()).hexdigest(), len(new_df)
+
+
+def ingested_version(file_version, sources):
+    """
+    Versão de um dataset com novos trimestres: a do spread.csv de origem e um hash das partes
+    incorporadas, em ordem. Os workers com os mesmos arquivos têm a mesma versão (e os mesmos
+    caches), qualquer que seja a ordem em que os incorporaram ou se foram reiniciados
+    """
+    digest = hashlib.sha1(repr(sorted(sources)).encode()).hexdigest()[:12]
+    return f"{file_version}+{digest}"
+
+
+def append_quarter(data, raw, source=None):
+    """Novo Dataset com as linhas validadas de um novo trimestre acrescentadas a data"""
+    new_df = validate_quarter(raw, data)
+    if source is None:
+        source = rows_source(new_df)
+    logger.info("%d linhas incorporadas ao dataset (%s)", len(new_df), source)
+    return data.append(new_df, ingested_version(data.file_version, data.sources | {source}),
+                       source)
+
+
+def ingest_quarter(raw, source=None):
+    """
+    Incorpora as linhas de um novo trimestre (colunas do CSV original) ao dataset atual,
+    calculando as colunas derivadas e o índice apenas dessas linhas, sem recarregar o CSV
+    """
+    with dataset_lock:
+        swap_dataset(append_quarter(dataset, raw, source))
+    return dataset
+
+
+def apply_incoming(data, directory=INCOMING_DIR):
+    """
+    Novo Dataset com os arquivos CSV da pasta de novos trimestres que ainda não fazem
+    parte de data (retorna o próprio data se não houver nenhum)
+    """
+    if not os.path.isdir(directory):
+        return data
+
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".csv"):
+            continue
+
+        # Um arquivo é identificado pelo nome, data de modificação e tamanho
+        file_path = os.path.join(directory, name)
+        stat = os.stat(file_path)
+        source = (name, stat.st_mtime_ns, stat.st_size)
+        if source in data.sources or source in rejected_sources:
+            continue
+
+        try:
+            data = append_quarter(data, pd.read_csv(file_path), source)
+        except (ValueError, OSError) as error:
+            # Arquivos inválidos (ou ainda sendo copiados) são ignorados até serem alterados
+            rejected_sources.add(source)
+            logger.warning("Arquivo %s ignorado: %s", file_path, error)
+    return data
+
+
+def ingest_incoming(directory=INCOMING_DIR):
+    """
+    Incorpora ao dataset atual os novos trimestres da pasta de arquivos incrementais
+    Retorna True se o dataset foi substituído
+    """
+    with dataset_lock:
+        data = apply_incoming(dataset, directory)
+        if data is dataset:
+            return False
+        swap_dataset(data)
+    return True
+
+
+def reload_dataset():
+    """
+    Recarrega o spread.csv (e os novos trimestres) fora das requisições e substitui o dataset
+    Retorna False se o arquivo mudou durante a leitura (a recarga é refeita na próxima verificação)
+    """
+    version = dataset_version(DATA_PATH)
+    rejected_sources.clear()
+    data = apply_incoming(Dataset(load_dataset(DATA_PATH), version))
+
+    # O arquivo pode ter sido alterado enquanto era lido
+    if dataset_version(DATA_PATH) != version:
+        return False
+
+    with dataset_lock:
+        swap_dataset(data)
+    logger.info("Dados recarregados de %s (versão %s)", DATA_PATH, version)
+    return True
+
+
+def check_data():
+    """Recarrega o spread.csv se ele mudou ou incorpora novos trimestres da pasta incremental"""
+    try:
+        file_changed = dataset_version(DATA_PATH) != dataset.file_version
+    except OSError:  # Arquivo sendo substituído: verifica de novo na próxima vez
+        return
+    if file_changed:
+        reload_dataset()
+    else:
+        ingest_incoming()
+
+
+def watch_data(interval=DATA_POLL_SECONDS):
+    """Verifica periodicamente os arquivos de dados (executado em uma thread)"""
+    report_memory()
+    while True:
+        time.sleep(interval)
+        try:
+            check_data()
+        except Exception:
+            logger.exception("Falha ao verificar os arquivos de dados")
+        report_memory(log=False)
+
 
-years = df["ANO"].unique()  # Anos unicos para o filtro
-banks = df["NOME_BANCO"].unique()  # Bancos unicos para o filtro
-quarters = df["TRIMESTRE"].unique()  # Trimestres unicos para o filtro
+def start_data_watcher(interval=DATA_POLL_SECONDS):
+    """Inicia a thread que recarrega os dados alterados sem reiniciar o processo"""
+    thread = threading.Thread(target=watch_data, args=(interval,),
+                              name="data-watcher", daemon=True)
+    thread.start()
+    return thread
+
+
+# Carregar o arquivo csv chamado "spread.csv" (ou o seu cache colunar) e os novos trimestres
+# (o dataset é substituído por inteiro quando os arquivos mudam, ver check_data)
+dataset = apply_incoming(Dataset(load_dataset(DATA_PATH), dataset_version(DATA_PATH)))
 
 app = Dash(__name__,
            title="Movimentação de Câmbio",
            update_title=None)
 
+# Aplicação WSGI usada em produção (gunicorn app:server, ver gunicorn.conf.py)
+server = app.server
+
+# Seleções com mais linhas que BACKGROUND_ROWS têm as figuras criadas em segundo plano, em outro
+# processo, para não ocupar a thread do worker (0 desativa; sem o diskcache, tudo é síncrono)
+BACKGROUND_ROWS = int(os.environ.get("DASH_BACKGROUND_ROWS", 20000))
+
+# Pasta do cache em disco dos resultados em segundo plano (compartilhada entre os workers)
+BACKGROUND_CACHE_DIR = os.environ.get("DASH_BACKGROUND_CACHE", "data/background-cache")
+
+# Intervalo (ms) com que o navegador consulta o andamento das figuras em segundo plano
+BACKGROUND_POLL_MS = 250
+
+
+def create_background_manager():
+    """
+    Gerenciador dos callbacks em segundo plano (processos locais com os resultados no diskcache),
+    ou None se estiverem desativados ou sem as dependências
+    Os resultados ficam guardados por versão dos dados e são reaproveitados em seleções repetidas
+    """
+    if diskcache is None or not BACKGROUND_ROWS:
+        return None
+    cache = diskcache.Cache(BACKGROUND_CACHE_DIR)
+    # A conexão com o SQLite é reaberta sob demanda em cada processo (os workers do gunicorn
+    # são criados depois da importação, com preload_app)
+    cache.close()
+    return dash.DiskcacheManager(cache, cache_by=[lambda: dataset.version], expire=3600)
+
+
+background_manager = create_background_manager()
+
+# Processos que criam e serializam em paralelo as figuras de uma seleção (0 desativa: as figuras
+# são criadas uma após a outra na thread da requisição). Os processos não usam o dataset:
+# recebem em cada tarefa apenas os dados da figura, obtidos no worker (ver pool_figures)
+FIGURE_PROCESSES = int(os.environ.get("DASH_FIGURE_PROCESSES", 0))
+
+# Pool de figuras do processo atual: (pid do processo que o criou, pool)
+figure_pool_state = (None, None)
+figure_pool_lock = threading.Lock()
+
+# Se o processo atual é um processo do pool de figuras
+in_figure_process = False
+
+
+def figure_process_ready():
+    """Tarefa vazia executada no início do pool, para que os processos sejam criados na hora"""
+    return os.getpid()
+
+
+def init_figure_process():
+    """
+    Prepara um processo do pool de figuras logo após o fork
+    Os caches herdados do worker são descartados (as figuras recebem os seus dados em cada
+    tarefa), e as etapas não são registradas nas métricas
+    """
+    global selection_cache, figure_cache, in_figure_process
+    selection_cache = LRUCache(SELECTION_CACHE_BYTES, frame_nbytes)
+    figure_cache = LRUCache(FIGURE_CACHE_BYTES, len)
+    in_figure_process = True
+
+
+def shutdown_pool(pool):
+    """Encerra um pool sem esperar pelas tarefas em andamento (e cancela as pendentes)"""
+    if sys.version_info >= (3, 9):
+        pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        pool.shutdown(wait=False)
+
+
+def start_figure_pool():
+    """
+    Cria (ou recria) o pool de figuras do processo atual
+    Deve ser chamado apenas antes de servir requisições, sem outras threads em execução
+    (post_fork do gunicorn ou início do servidor de desenvolvimento): o fork copiaria fechadas
+    as travas mantidas por outras threads. O pool não é herdado pelos processos criados depois
+    Com FIGURE_PROCESSES = 0, sem fork no sistema ou antes do Python 3.7 (sem initializer e
+    mp_context no ProcessPoolExecutor), apenas encerra o pool existente
+    """
+    global figure_pool_state
+    with figure_pool_lock:
+        pid, previous = figure_pool_state
+        pool = None
+        if FIGURE_PROCESSES and sys.version_info < (3, 7):
+            logger.warning("DASH_FIGURE_PROCESSES requer Python 3.7 ou mais recente; "
+                           "as figuras são criadas na thread da requisição")
+        elif FIGURE_PROCESSES and "fork" in multiprocessing.get_all_start_methods():
+            pool = ProcessPoolExecutor(FIGURE_PROCESSES, initializer=init_figure_process,
+                                       mp_context=multiprocessing.get_context("fork"))
+            # Com fork, todos os processos são criados na primeira tarefa
+            pool.submit(figure_process_ready).result()
+            logger.info("Pool de figuras com %d processos no processo %d",
+                        FIGURE_PROCESSES, os.getpid())
+        figure_pool_state = (os.getpid(), pool)
+    if previous is not None and pid == os.getpid():
+        shutdown_pool(previous)
+    return pool
+
+
+def stop_figure_pool(pool):
+    """Desativa o pool de figuras do processo atual (se ainda for pool)"""
+    global figure_pool_state
+    with figure_pool_lock:
+        if figure_pool() is not pool:
+            return
+        figure_pool_state = (os.getpid(), None)
+    shutdown_pool(pool)
+
+
+def figure_pool():
+    """Pool de figuras criado pelo processo atual, ou None (desativado ou herdado por fork)"""
+    pid, pool = figure_pool_state
+    return pool if pid == os.getpid() else None
+
+
+# Métricas de latência dos callbacks, expostas no formato do Prometheus em /metrics
+CALLBACK_SECONDS = Histogram(
+    "dash_callback_duration_seconds", "Tempo total de execução do callback",
+    ["callback"])
+STAGE_SECONDS = Histogram(
+    "dash_callback_stage_duration_seconds",
+    "Tempo de cada etapa do callback (filtragem, agregação, criação e serialização das figuras)",
+    ["callback", "stage"])
+PAYLOAD_BYTES = Histogram(
+    "dash_callback_payload_bytes", "Tamanho da resposta do callback enviada ao navegador",
+    ["callback"], buckets=[2 ** exp for exp in range(10, 26)])
+
+# Memória de cada worker (um valor por processo): residente, compartilhada e ocupada pelo dataset
+WORKER_MEMORY_BYTES = Gauge(
+    "dash_worker_memory_bytes", "Memória do worker: residente, compartilhada e do dataset",
+    ["kind"], multiprocess_mode="liveall")
+
+# Callback em execução em cada thread (as etapas são registradas com o seu nome)
+metrics_context = threading.local()
+
+
+def instrument(name):
+    """Decorador que registra o tempo total do callback name e o tamanho da sua resposta"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = getattr(metrics_context, "callback", None)
+            metrics_context.callback = name
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                metrics_context.callback = previous
+                CALLBACK_SECONDS.labels(name).observe(end - start)
+
+                # A serialização da resposta e o seu tamanho são medidos em record_payload
+                if flask.has_request_context():
+                    flask.g.metrics_callback = (name, end)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name):
+    """Registra o tempo da etapa name dentro do callback em execução"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Os processos do pool de figuras não registram métricas (ver init_figure_process)
+        if not in_figure_process:
+            STAGE_SECONDS.labels(getattr(metrics_context, "callback", None) or "-", name)\
+                .observe(time.perf_counter() - start)
+
+
+@server.after_request
+def record_payload(response):
+    """Registra o tempo de serialização e o tamanho da resposta dos callbacks instrumentados"""
+    callback = flask.g.pop("metrics_callback", None)
+    if callback is not None:
+        name, end = callback
+        STAGE_SECONDS.labels(name, "serialize").observe(time.perf_counter() - end)
+        PAYLOAD_BYTES.labels(name).observe(response.calculate_content_length() or 0)
+    return response
+
+
+def process_memory():
+    """Memória residente e compartilhada (bytes) do processo atual, ou None fora do Linux"""
+    try:
+        with open("/proc/self/statm") as statm:
+            _, resident, shared = statm.read().split()[:3]
+    except OSError:
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    return int(resident) * page_size, int(shared) * page_size
+
+
+def report_memory(log=True):
+    """Atualiza as métricas de memória do worker (e registra no log o tamanho do dataset)"""
+    data = dataset
+    dataset_bytes = frame_nbytes(data.df)
+    WORKER_MEMORY_BYTES.labels("dataset").set(dataset_bytes)
+
+    memory = process_memory()
+    if memory is not None:
+        WORKER_MEMORY_BYTES.labels("resident").set(memory[0])
+        WORKER_MEMORY_BYTES.labels("shared").set(memory[1])
+
+    if log:
+        logger.info("Dataset %s: %d linhas, %.1f MB no processo %d%s",
+                    data.version, len(data.df), dataset_bytes / 1024 / 1024, os.getpid(),
+                    f" ({memory[0] / 1024 / 1024:.1f} MB residentes)" if memory else "")
+
+
+@server.route("/metrics")
+def metrics():
+    """Métricas no formato do Prometheus (somando todos os workers com PROMETHEUS_MULTIPROC_DIR)"""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        report_memory(log=False)
+    return flask.Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+# Colunas exibidas no DataTable
+TABLE_COLUMNS = ['NOME_BANCO', 'ANO_TRIMESTRE', 'VOLUME_OP',
+                 'VOLUME_INTERBANK', 'RESULT_OP']
+
+# Quantidade de linhas por página do DataTable
+TABLE_PAGE_SIZE = 14
+
+# Colunas exibidas em bilhões ("x.xxBi"), formatadas no navegador pelo DataTable
+BILLION_COLUMNS = ['VOLUME_OP', 'VOLUME_INTERBANK', 'RESULT_OP']
+
+
+# Colunas do dataframe usadas para ordenar as colunas do DataTable que não existem nos dados
+TABLE_SORT_COLUMNS = {"ANO_TRIMESTRE": "ANO-TRIMESTRE"}
+
+# Ordenação inicial do DataTable
+TABLE_SORT_BY = [{"column_id": "ANO_TRIMESTRE", "direction": "desc"},
+                 {"column_id": "RESULT_OP", "direction": "desc"}]
+
+# Seleção inicial dos dropdowns: todos os anos, os 4 trimestres e os principais bancos
+DEFAULT_QUARTERS = ["03", "06", "09", "12"]
+DEFAULT_BANKS = ["BB", "ITAU", "BRADESCO", "SANTANDER"]
+
 
 def data_table(df):
 
     # Armazena as colunas relevantes do dataframe df em uma nova variável 'table'
-    table = df[['NOME_BANCO', 'ANO_TRIMESTRE', 'VOLUME_OP',
-                'VOLUME_INTERBANK', 'RESULT_OP']].copy()
+    # O período "AAAA-MM" é formatado a partir da coluna de datas (ANO-TRIMESTRE)
+    table = pd.DataFrame({
+        col: df["ANO-TRIMESTRE"].dt.strftime("%Y-%m") if col == "ANO_TRIMESTRE" else df[col]
+        for col in TABLE_COLUMNS
+    })
 
     return table
 
-# Criando a visulização Table baseada no DataFrame
-table = data_table(df)
+# Criando a visulização Table baseada no DataFrame (apenas as colunas são usadas)
+table = data_table(dataset.df.head(0))
 
 
 def table_cols(table):
@@ -84,12 +1172,22 @@ def table_cols(table):
     # relacionando o nome de cada coluna com sua identificação
     cols = [{"name": i, "id": i} for i in table.columns]
 
+    # Formato "x.xxBi " aplicado pelo navegador aos valores em bilhões
+    def billion_format():
+        return Format(precision=2, scheme=Scheme.fixed)\
+            .symbol(Symbol.yes)\
+            .symbol_suffix("Bi ")
+
     # Sobrescreve 'cols' com uma nova lista, agora especificando o nome que cada coluna deve ter na exibição
     cols = [{"name": ["", "Banco"], "id": "NOME_BANCO"},
             {"name": ["", "Ano"], "id": "ANO_TRIMESTRE"},
-            {"name": ["(USD)", "Vol. Prim."], "id": "VOLUME_OP"},
-            {"name": ["(USD)", "Vol. Inter."], "id": "VOLUME_INTERBANK"},
-            {"name": ["(BRL)", "Result. Op."], "id": "RESULT_OP"}]
+            {"name": ["(USD)", "Vol. Prim."], "id": "VOLUME_OP",
+             "type": "numeric", "format": billion_format()},
+            {"name": ["(USD)", "Vol. Inter."], "id": "VOLUME_INTERBANK",
+             "type": "numeric", "format": billion_format()},
+            # Resultados iguais a zero são enviados como nulos e exibidos como "0"
+            {"name": ["(BRL)", "Result. Op."], "id": "RESULT_OP",
+             "type": "numeric", "format": billion_format().nully("0")}]
 
     return cols
 
@@ -123,155 +1221,206 @@ cell_style = {
 }
 
 # Criando o Layout para o Dashboard
-app.layout = html.Div(
-    [
-        html.Div(  # Div Layout
-            [
-                html.Img(src="assets/uce_logo.png",
-                         className="logo"),  # Logo UNI
-                html.H1(
-                    "Movimentação de Câmbio",  # Titulo
-                    className="layout-title",
-                ),
-            ],
-            className="layout",
-        ),
-        html.Div(  # Div esquerdo
-            [
-                html.Div(  # Div dos Dropdowns
-                    [
-                        html.Br(),
-                        html.H2(  # Titulo
-                            "Selecione o filtro desejado",
-                            className="title-dropdown"
-                        ),
-                        html.Label("Ano",
-                                   className="dropdown-labels"),
-                        dcc.Dropdown(  # Filtro do Ano, retornando os 4 trimestres como padrão
-                            id="year-dropdown",
-                            options=[  # Valores unicos a filtrar
-                                {"label": year, "value": year} for year in years
-                            ],
-                            value=years,  # Valores iniciais
-                            multi=True,  # Permitindo selecionar mais que um valor
-                            className="dropdown",
-                            optionHeight=50,  # Altura das opções (Estetica)
-                        ),
-                        # Nome acima do dropdown
-                        html.Label("Trimestre",
-                                   className="dropdown-labels"),
-                        dcc.Dropdown(  # Filtro do Trimestre, retornando os 4 trimestres como padrão
-                            id="quarter-dropdown",
-                            options=[  # Valores unicos a filtrar
-                                {"label": quarter, "value": quarter}
-                                for quarter in quarters
-                            ],
-                            value=["03", "06", "09", "12"],  # Valores iniciais
-                            multi=True,  # Permitindo selecionar mais que um valor
-                            className="dropdown",
-                            optionHeight=50,  # Altura das opções (Estetica)
-                        ),
-                        html.Label(
-                            "Instituição Bancária",
-                            className="dropdown-labels"
-                        ),  # Nome acima do dropdown
-                        dcc.Dropdown(  # Filtro do Banco, retornando os 4 principais como padrão
-                            id="bank-dropdown",
-                            options=[  # Valores unicos a filtrar
-                                {"label": bank, "value": bank} for bank in banks
-                            ],
-                            value=[
-                                "BB",
-                                "ITAU",
-                                "BRADESCO",
-                                "SANTANDER",
-                            ],  # Valores iniciais (Principais Bancos)
-                            multi=True,  # Permitindo selecionar mais que um valor
-                            className="dropdown",
-                            optionHeight=50,  # Altura das opções (Estetica)
-                        ),
-                        html.Button(
-                            'Todos os Bancos',
-                            id='select_all',
-                            n_clicks=0,
-                            className="button-dropdown"
-                        ),
-                    ],
-                    className="dropdown-container",
-                ),
-                html.Div(  # Pieplot
-                    [dcc.Graph(id="operations-result-pieplot",
-                               className="pieplot")],
-                    className="pieplot-container",
-                ),
-                html.Div(
-                    [dash_table.DataTable(id='table',
-                                          columns=cols,
-                                          data=table.to_dict("records"),
-                                          style_data=cell_style,
-                                          style_cell={
-                                              'textAlign': 'center'
-                                          },
-                                          style_header=header_style,
-                                          style_table=table_style,
-                                          sort_action="native",
-                                          sort_mode="multi",
-                                          sort_by=[{"column_id": "ANO_TRIMESTRE", "direction": "desc"},
-                                                   {"column_id": "RESULT_OP", "direction": "desc"}],
-                                          merge_duplicate_headers=True,
-                                          page_size=14
-                                          )],
-                    className='table'
-                ),
-            ],
-            className="left-container",
-        ),
-        html.Div(  # Div dos Graficos
-            [
-                html.Div(  # Div dos botoes
-                    [
-                        html.Button(
-                            "Trimestral",
-                            id="trimestral-button",
-                            n_clicks=0,
-                            className="button",
-                        ),
-                        html.Button(
-                            "Por ano",
-                            id="ano-button",
-                            n_clicks=0,
-                            className="button"
-                        ),
-                    ],
-                    className="button-container",
-                ),
-                html.Div(  # Gráfico de Barras numero de operações
-                    [
-                        dcc.Graph(id="bar-lineplot",
-                                  className="bar-lineplot"),
-                    ],
-                    className="bar-lineplot-container",
-                ),
-                html.Div(  # Gráfico de Linha Spread
-                    [dcc.Graph(id="spread-lineplot",
-                               className="spreadlineplot")],
-                    className="spreadlineplot-container",
-                ),
-                html.Div(  # Grafico de Linha Resultados
-                    [dcc.Graph(id="operations-result-lineplot",
-                               className="lineplot")],
-                    className="lineplot-container",
-                ),
-            ],
-            className="graph-container",
-        ),
-    ],
-    className="main-container",
-)
+def serve_layout():
+    """
+    Layout do Dashboard, criado a cada carregamento da página com a versão atual dos dados
+    A tabela, os gráficos e as opções dos dropdowns já vêm preenchidos para a seleção inicial
+    (pré-calculada em warm_up), sem esperar pelos callbacks
+    """
+    data = dataset
+    years = data.years  # Anos unicos para o filtro
+    year_options, quarter_options, bank_options = dropdown_options(data)
+    initial = initial_values(data)
+
+    return html.Div(
+        [
+            html.Div(  # Div Layout
+                [
+                    html.Img(src="assets/uce_logo.png",
+                             className="logo"),  # Logo UNI
+                    html.H1(
+                        "Movimentação de Câmbio",  # Titulo
+                        className="layout-title",
+                    ),
+                ],
+                className="layout",
+            ),
+            html.Div(  # Div esquerdo
+                [
+                    html.Div(  # Div dos Dropdowns
+                        [
+                            html.Br(),
+                            html.H2(  # Titulo
+                                "Selecione o filtro desejado",
+                                className="title-dropdown"
+                            ),
+                            html.Label("Ano",
+                                       className="dropdown-labels"),
+                            dcc.Dropdown(  # Filtro do Ano, retornando os 4 trimestres como padrão
+                                id="year-dropdown",
+                                options=year_options,  # Valores unicos a filtrar
+                                value=years,  # Valores iniciais
+                                multi=True,  # Permitindo selecionar mais que um valor
+                                className="dropdown",
+                                optionHeight=50,  # Altura das opções (Estetica)
+                            ),
+                            # Nome acima do dropdown
+                            html.Label("Trimestre",
+                                       className="dropdown-labels"),
+                            dcc.Dropdown(  # Filtro do Trimestre, retornando os 4 trimestres como padrão
+                                id="quarter-dropdown",
+                                options=quarter_options,  # Valores unicos a filtrar
+                                value=DEFAULT_QUARTERS,  # Valores iniciais
+                                multi=True,  # Permitindo selecionar mais que um valor
+                                className="dropdown",
+                                optionHeight=50,  # Altura das opções (Estetica)
+                            ),
+                            html.Label(
+                                "Instituição Bancária",
+                                className="dropdown-labels"
+                            ),  # Nome acima do dropdown
+                            dcc.Dropdown(  # Filtro do Banco, retornando os 4 principais como padrão
+                                id="bank-dropdown",
+                                options=bank_options,  # Valores unicos a filtrar
+                                value=DEFAULT_BANKS,  # Valores iniciais (Principais Bancos)
+                                multi=True,  # Permitindo selecionar mais que um valor
+                                className="dropdown",
+                                optionHeight=50,  # Altura das opções (Estetica)
+                            ),
+                            html.Button(
+                                'Todos os Bancos',
+                                id='select_all',
+                                n_clicks=0,
+                                className="button-dropdown"
+                            ),
+                            # Versão dos dados exibida e verificação periódica de novas versões
+                            dcc.Store(id="data-version", data=data.version),
+                            dcc.Interval(id="data-interval",
+                                         interval=DATA_POLL_SECONDS * 1000),
+                            # Hash do layout de cada figura exibida (para enviar apenas os traços)
+                            dcc.Store(id="figure-layouts", data=initial["layouts"]),
+                            # Seleção cujas figuras são criadas em segundo plano e o seu andamento
+                            dcc.Store(id="figure-job"),
+                            html.Progress(id="figures-progress", hidden=True,
+                                          className="figures-progress"),
+                        ],
+                        className="dropdown-container",
+                    ),
+                    html.Div(  # Pieplot
+                        [dcc.Graph(id="operations-result-pieplot",
+                                   figure=initial["pieplot"],
+                                   className="pieplot")],
+                        className="pieplot-container",
+                    ),
+                    html.Div(
+                        [dash_table.DataTable(id='table',
+                                              columns=cols,
+                                              # Os dados de cada página são enviados pelo servidor (update_table)
+                                              data=initial["records"],
+                                              page_count=initial["page_count"],
+                                              style_data=cell_style,
+                                              style_cell={
+                                                  'textAlign': 'center'
+                                              },
+                                              style_header=header_style,
+                                              style_table=table_style,
+                                              # Paginação e ordenação feitas no servidor
+                                              page_action="custom",
+                                              page_current=0,
+                                              sort_action="custom",
+                                              sort_mode="multi",
+                                              sort_by=TABLE_SORT_BY,
+                                              merge_duplicate_headers=True,
+                                              page_size=TABLE_PAGE_SIZE
+                                              )],
+                        className='table'
+                    ),
+                ],
+                className="left-container",
+            ),
+            html.Div(  # Div dos Graficos
+                [
+                    html.Div(  # Div dos botoes
+                        [
+                            html.Button(
+                                "Trimestral",
+                                id="trimestral-button",
+                                n_clicks=0,
+                                className="button",
+                            ),
+                            html.Button(
+                                "Por ano",
+                                id="ano-button",
+                                n_clicks=0,
+                                className="button"
+                            ),
+                            # Modo ativo do gráfico de barras (mantido nas mudanças de filtro)
+                            dcc.Store(id="barplot-mode", data="trimestral"),
+                            # Figuras dos dois modos do gráfico de barras (a troca é feita no navegador)
+                            dcc.Store(id="barplot-figures", data=initial["barplot_figures"]),
+                        ],
+                        className="button-container",
+                    ),
+                    html.Div(  # Gráfico de Barras numero de operações
+                        [
+                            dcc.Graph(id="bar-lineplot",
+                                      className="bar-lineplot"),
+                        ],
+                        className="bar-lineplot-container",
+                    ),
+                    html.Div(  # Gráfico de Linha Spread
+                        [dcc.Graph(id="spread-lineplot",
+                                   figure=initial["spread_lineplot"],
+                                   className="spreadlineplot")],
+                        className="spreadlineplot-container",
+                    ),
+                    html.Div(  # Grafico de Linha Resultados
+                        [dcc.Graph(id="operations-result-lineplot",
+                                   figure=initial["lineplot"],
+                                   className="lineplot")],
+                        className="lineplot-container",
+                    ),
+                ],
+                className="graph-container",
+            ),
+        ],
+        className="main-container",
+    )
+
+
+def filter_data_mask(selected_year, selected_quarter, selected_bank, df):
+    """Máscara booleana das linhas selecionadas do dataframe (caminho sem índice)"""
+    return (
+        (df["ANO"].isin(selected_year))
+        & (df["TRIMESTRE"].isin(selected_quarter))
+        & (df["NOME_BANCO"].isin(selected_bank))
+    ).to_numpy()
 
 
-def filter_data(selected_year, selected_quarter, selected_bank, df=df):
-    """Função de filtrar quais valores selecionados do dataframe"""
+def take_values(values, positions):
+    """
+    Valores de uma coluna nas posições pedidas
+    Colunas categóricas voltam aos valores originais (o plotly express não aceita
+    categorias sem linhas nos dados)
+    """
+    values = values.array.take(positions)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values)
+    return values
+
+
+def filter_data(selected_year, selected_quarter, selected_bank, df=None, index=None,
+                columns=None):
+    """
+    Função de filtrar quais valores selecionados do dataframe
+    Sem df, filtra o dataset atual com o seu índice. Com df, o índice precisa ter sido
+    criado a partir do mesmo df (index=None usa as máscaras)
+    Com columns, apenas essas colunas são copiadas para o dataframe filtrado
+    """
+    if df is None:
+        data = dataset
+        df, index = data.df, data.index
+
     # Verifica se os valores selecionados para ano, trimestre e banco são listas, caso contrário converte para listas
     if not isinstance(selected_year, list):
         selected_year = [selected_year]
@@ -280,63 +1429,285 @@ def filter_data(selected_year, selected_quarter, selected_bank, df=df):
     if not isinstance(selected_bank, list):
         selected_bank = [selected_bank]
 
-    # Filtra o dataframe com base nos valores selecionados
-    filtered_df = df[
-        (df["ANO"].isin(selected_year))
-        & (df["TRIMESTRE"].isin(selected_quarter))
-        & (df["NOME_BANCO"].isin(selected_bank))
-    ]
+    if index is None:
+        # Filtra o dataframe com base nos valores selecionados
+        positions = np.flatnonzero(filter_data_mask(
+            selected_year, selected_quarter, selected_bank, df))
+    else:
+        # Busca as posições das linhas selecionadas no índice
+        positions = index.positions(
+            selected_year, selected_quarter, selected_bank)
+
+    # Copia só as linhas selecionadas das colunas pedidas, coluna a coluna
+    # A partir do pandas 1.3, copy=False evita juntar as colunas em blocos, o que faria mais
+    # uma cópia; no pandas 1.1 do requirements.txt o parâmetro é ignorado para dicionários e as
+    # colunas de mesmo tipo ainda são copiadas para um único bloco
+    filtered_df = pd.DataFrame(
+        {col: take_values(df[col], positions)
+         for col in (df.columns if columns is None else columns)},
+        index=df.index.take(positions),
+        copy=False,
+    )
 
     # Adiciona uma coluna 'ANO-TRIMESTRE' ao dataframe se ela não existir
     # A coluna é criada a partir das colunas 'ANO' e 'TRIMESTRE' com formato de string
     # Essa coluna é convertida para um objeto datetime
+    # (em um novo dataframe, sem escrever no recorte do dataframe original)
     if "ANO-TRIMESTRE" not in filtered_df.columns:
-        filtered_df["ANO-TRIMESTRE"] = filtered_df.apply(
-            lambda x: str(x["ANO"]) + "-" + x["TRIMESTRE"], axis=1
-        )
-        filtered_df["ANO-TRIMESTRE"] = pd.to_datetime(
-            filtered_df["ANO-TRIMESTRE"], format="%Y-%m"
-        )
+        filtered_df = filtered_df.assign(**{"ANO-TRIMESTRE": pd.to_datetime(
+            filtered_df["ANO"].astype(str) + "-" + filtered_df["TRIMESTRE"].astype(str),
+            format="%Y-%m"
+        )})
 
     # Retorna o dataframe filtrado
     return filtered_df
 
 
+# Colunas lidas pelos callbacks nos dados filtrados compartilhados (tabela e gráficos)
+SELECTION_COLUMNS = ["NOME_BANCO", "ANO-TRIMESTRE", "VOLUME_OP", "VOLUME_INTERBANK",
+                     "RESULT_OP", "TOTAL_OP", "TOTAL_N", "SPREAD"]
+
+
+def normalize_selection(selected_year, selected_quarter, selected_bank):
+    """Normaliza os valores dos dropdowns em tuplas ordenadas, usadas como chave dos caches"""
+
+    def as_tuple(values):
+        # Converte valores únicos em lista e remove valores vazios e repetidos
+        if not isinstance(values, list):
+            values = [values]
+        return tuple(sorted({value for value in values if value is not None}))
+
+    return as_tuple(selected_year), as_tuple(selected_quarter), as_tuple(selected_bank)
+
+
+def cached_filter_data(selection, data=None):
+    """
+    Dados filtrados da seleção normalizada, calculados uma única vez por seleção e versão dos dados
+    O dataframe retornado (apenas com SELECTION_COLUMNS) é compartilhado entre os callbacks
+    e não deve ser alterado
+    """
+    data = data or dataset
+
+    def create():
+        with stage("filter_data"):
+            return filter_data(*map(list, selection), data.df, data.index, SELECTION_COLUMNS)
+
+    return selection_cache.get_or_create((data.version, "filter_data", selection), create)
+
+
+def cached_aggregate(selection, name, func, data=None):
+    """Agregado func(dados filtrados) da seleção, calculado uma única vez por seleção e versão dos dados"""
+    data = data or dataset
+
+    def create():
+        filtered_df = cached_filter_data(selection, data)
+        with stage("aggregate"):
+            return func(filtered_df)
+
+    return selection_cache.get_or_create((data.version, name, selection), create)
+
+
+def cached_figure(selection, name, builder, data=None):
+    """
+    Figura name da seleção, construída por builder() uma única vez por versão dos dados
+    Seleções repetidas retornam o JSON já serializado, sem criar a figura novamente
+    """
+    data = data or dataset
+
+    def create():
+        with stage("figure_build"):
+            figure = builder()
+        with stage("to_json"):
+            return figure.to_json()
+
+    figure_json = figure_cache.get_or_create((data.version, name, selection), create)
+    with stage("from_json"):
+        return json_loads(figure_json)
+
+
+@app.server.route("/cache-stats")
+def cache_stats():
+    """Contadores de acertos e erros dos caches"""
+    return {
+        "selection_cache": selection_cache.stats(),
+        "figure_cache": figure_cache.stats(),
+    }
+
+
+def table_order(filtered_df, sort_by):
+    """
+    Posições das linhas de filtered_df ordenadas pelas colunas de sort_by
+    (lista de {"column_id", "direction"} do DataTable, ordenação estável)
+    """
+    # Considera apenas as colunas exibidas na tabela
+    sort_by = [col for col in sort_by or [] if col["column_id"] in TABLE_COLUMNS]
+    if not sort_by:
+        return np.arange(len(filtered_df))
+
+    # Ordena pelos códigos ordenados de cada coluna (sem copiar o dataframe), em ordem estável
+    # Os valores nulos ficam por último nas duas direções, como no sort_values
+    keys = []
+    for col in sort_by:
+        column = TABLE_SORT_COLUMNS.get(col["column_id"], col["column_id"])
+        codes, uniques = pd.factorize(filtered_df[column], sort=True)
+        if col["direction"] != "asc":
+            codes = len(uniques) - 1 - codes
+        keys.append(np.where(codes < 0, len(uniques), codes))
+
+    # O np.lexsort usa a última chave como a principal
+    return np.lexsort(keys[::-1])
+
+
 @app.callback(
-    Output('table', 'data'),
-    [  # Parametros de inputs (Ano, Trimestre e Banco)
-        Input("year-dropdown", "value"),
-        Input("quarter-dropdown", "value"),
-        Input("bank-dropdown", "value"),
+    [
+        Output('table', 'data', allow_duplicate=True),
+        Output('table', 'page_count', allow_duplicate=True),
+        Output('table', 'page_current', allow_duplicate=True),
+    ],
+    [  # Página e ordenação escolhidas no DataTable
+        Input('table', 'page_current'),
+        Input('table', 'sort_by'),
     ],
+    [  # Filtros selecionados (Ano, Trimestre e Banco) e tamanho da página
+        State("year-dropdown", "value"),
+        State("quarter-dropdown", "value"),
+        State("bank-dropdown", "value"),
+        State('table', 'page_size'),
+    ],
+    # A primeira página de cada seleção é enviada pelo update_selection
+    prevent_initial_call=True,
 )
-def update_table(selected_year, selected_quarter, selected_bank):
-    """Atualiza os gráficos baseados nos filtros escolhidos no dropdown"""
+@instrument("update_table")
+def update_table(page_current, sort_by, selected_year, selected_quarter, selected_bank,
+                 page_size):
+    """
+    Atualiza a tabela quando a página ou a ordenação mudam no DataTable
+    Apenas as linhas da página visível são ordenadas, formatadas e enviadas
+    """
+    selection = normalize_selection(selected_year, selected_quarter, selected_bank)
+    return table_page(selection, page_current, sort_by, page_size)
 
-    # Filtra os dados com base nos parâmetros selecionados
-    filtered_df = filter_data(selected_year, selected_quarter, selected_bank)\
 
+def format_table(table):
+    """
+    Converte os valores numéricos da tabela para bilhões em uma única operação vetorizada
+    O texto "x.xxBi" é montado no navegador pelo formato das colunas (table_cols)
+    """
     # Divide os valores numéricos por 1 milhão para que sejam exibidos em unidades bilionárias
-    filtered_df['VOLUME_OP'] = filtered_df['VOLUME_OP'] / 1000000
-    filtered_df['VOLUME_INTERBANK'] = filtered_df['VOLUME_INTERBANK'] / 1000000
-    filtered_df['RESULT_OP'] = filtered_df['RESULT_OP'] / 1000000
+    values = table[BILLION_COLUMNS] / 1000000
+
+    # RESULT_OP igual a zero vira nulo para ser exibido sem a unidade, como "0"
+    values["RESULT_OP"] = values["RESULT_OP"].where(values["RESULT_OP"] != 0)
+
+    table[BILLION_COLUMNS] = values
+    return table
+
 
-    # Converte os valores numéricos em strings com duas casas decimais e os concatena com a unidade bilhão (Bi)
-    filtered_df['VOLUME_OP'] = filtered_df['VOLUME_OP'].apply(
-        lambda x: f"{x:.2f}Bi ")
-    filtered_df['VOLUME_INTERBANK'] = filtered_df['VOLUME_INTERBANK'].apply(
-        lambda x: f"{x:.2f}Bi ")
+def table_page(selection, page_current, sort_by, page_size=TABLE_PAGE_SIZE, data=None):
+    """
+    Registros da página page_current da tabela da seleção normalizada, ordenada por sort_by
+    Retorna os registros, a quantidade de páginas e a página efetivamente exibida
+    """
+    data = data or dataset
+    filtered_df = cached_filter_data(selection, data)
+
+    # Quantidade de páginas da seleção (ao menos uma, mesmo sem dados)
+    page_size = page_size or TABLE_PAGE_SIZE
+    page_count = max(-(-len(filtered_df) // page_size), 1)
+    page_current = min(max(page_current or 0, 0), page_count - 1)
+
+    # Ordem das linhas, calculada uma única vez por seleção e ordenação
+    sort_key = tuple((col["column_id"], col["direction"]) for col in sort_by or [])
+    order = cached_aggregate(selection, ("table_order", sort_key),
+                             lambda df: table_order(df, sort_by), data)
+
+    with stage("format_table"):
+        # Copia apenas as colunas e as linhas da página visível, sem alterar os dados do cache
+        page = order[page_current * page_size:(page_current + 1) * page_size]
+        filtered_df = format_table(data_table(filtered_df.take(page)))
+
+        # Converte o dataframe em um dicionário de registros para exibição na página da web
+        records = filtered_df.to_dict("records")
+
+    return records, page_count, page_current
 
-    # Verifica se RESULT_OP é diferente de zero antes de fazer a divisão e a concatenação
-    filtered_df.loc[filtered_df['RESULT_OP'] != 0, 'RESULT_OP']\
-        = filtered_df['RESULT_OP'][filtered_df['RESULT_OP'] != 0].apply(lambda x: f"{x:.2f}Bi ")
 
-    # Converte o dataframe em um dicionário de registros para exibição na página da web
-    return filtered_df.to_dict("records")
+# Número de pontos (somando todas as linhas) a partir do qual os gráficos de linha passam a usar
+# WebGL (Scattergl, no modo "auto") e deixam de exibir o valor de cada ponto como texto
+LINE_WEBGL_POINTS = 1000
 
+# Modo de renderização das linhas dos gráficos: "auto" (WebGL acima de LINE_WEBGL_POINTS
+# pontos), "svg" (sempre Scatter) ou "webgl" (sempre Scattergl)
+RENDER_MODES = ("auto", "svg", "webgl")
+RENDER_MODE = os.environ.get("DASH_RENDER_MODE", "auto")
+if RENDER_MODE not in RENDER_MODES:
+    raise ValueError(f"DASH_RENDER_MODE inválido: {RENDER_MODE!r} (use {', '.join(RENDER_MODES)})")
 
-def update_lineplot(filtered_df):
-    """Função que cria um lineplot com os filtros selecionados"""
+# Número máximo de pontos de um gráfico de linha; acima dele, cada linha é reduzida
+LINE_MAX_POINTS = 5000
+
+# Número mínimo de pontos mantidos em cada linha reduzida
+LINE_MIN_TRACE_POINTS = 16
+
+
+def downsample_lines(df, y, max_points=LINE_MAX_POINTS, x="ANO-TRIMESTRE", group="NOME_BANCO"):
+    """
+    Reduz as linhas (uma por valor de group) de um gráfico para cerca de max_points pontos.
+    Cada linha, em ordem de x, é dividida em intervalos e de cada um são mantidos os pontos
+    de menor e de maior y (além do primeiro e do último da linha), preservando os picos e
+    os vales. As linhas seguem na ordem em que aparecem em df.
+    """
+    if len(df) <= max_points:
+        return df
+
+    # Linha de cada ponto (na ordem em que aparecem) e ordenação por linha e por x
+    codes, uniques = pd.factorize(df[group])
+    order = np.lexsort((df[x].to_numpy(), codes))
+    codes = codes[order]
+    counts = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # Intervalos por linha (cada um mantém até dois pontos)
+    buckets = max(max_points // len(uniques), LINE_MIN_TRACE_POINTS) // 2
+    rank = np.arange(len(codes)) - starts[codes]
+    keys = codes * buckets + rank * buckets // counts[codes]
+
+    # Ordenando por intervalo e por y, o primeiro ponto de cada intervalo é o mínimo e o último,
+    # o máximo
+    by_value = np.lexsort((df[y].to_numpy()[order], keys))
+    sorted_keys = keys[by_value]
+    boundary = np.flatnonzero(np.diff(sorted_keys)) + 1
+    first = np.concatenate([[0], boundary])
+    last = np.concatenate([boundary - 1, [len(keys) - 1]])
+
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[by_value[first]] = True
+    keep[by_value[last]] = True
+    keep[starts] = True
+    keep[starts + counts - 1] = True
+    return df.take(order[keep])
+
+
+def use_webgl(n_points, render_mode=None):
+    """Se linhas com n_points pontos devem ser desenhadas com WebGL (Scattergl)"""
+    render_mode = render_mode or RENDER_MODE
+    if render_mode == "auto":
+        return n_points > LINE_WEBGL_POINTS
+    return render_mode == "webgl"
+
+
+def update_lineplot(filtered_df, render_mode=None):
+    """
+    Função que cria um lineplot com os filtros selecionados
+    render_mode substitui o RENDER_MODE ("auto", "svg" ou "webgl")
+    """
+
+    # Com muitos pontos, as linhas são reduzidas e deixam de exibir o texto dos pontos
+    dense = len(filtered_df) > LINE_WEBGL_POINTS
+    webgl = use_webgl(len(filtered_df), render_mode)
+    filtered_df = downsample_lines(filtered_df, "TOTAL_OP")
+    # Resultado das operações em bilhões, exibido no texto dos pontos (ou só no hover)
+    bilhoes = filtered_df["TOTAL_OP"] / 1000000
 
     # Criando a figura de Visualização
     fig = px.line(
@@ -348,126 +1719,94 @@ def update_lineplot(filtered_df):
             "ANO-TRIMESTRE": "Ano e Trimestre",  # Nome da coluna no eixo X
             "TOTAL_OP": "Resultado das Operações",  # Nome da coluna no eixo Y
         },
-        custom_data=["NOME_BANCO"],  # Dados customizados
+        # Dados customizados (no modo denso, o valor em bilhões usado no hover)
+        custom_data=[bilhoes] if dense else ["NOME_BANCO"],
         title="Resultado das Operações",  # Título do gráfico
-        text=filtered_df["TOTAL_OP"] / 1000000,  # Informações de texto
+        text=None if dense else bilhoes,  # Informações de texto
         markers=True,  # Marcadores nos pontos do gráfico
         symbol="NOME_BANCO",  # Coluna usada para diferenciação de marcadores
         color_discrete_map=bank_colors,  # Paleta de cores pré-definidas para cada Banco
+        render_mode="webgl" if webgl else "svg",  # Scattergl ou Scatter
+        template=FIGURE_TEMPLATE,  # Tema dos gráficos (largura da linha e posição do texto)
     )
 
-    fig.update_traces(  # Atualizando o traço do LinePlot
-        line=dict(width=1.8),  # Largura da linha
-        textposition="bottom right",  # Posição do infotext
-        texttemplate="%{text:.2f} Bi",  # Template do infotext
-        hovertemplate="<br>".join([  # Template do hoverinfo
-            "<br>Resultado das Operações: %{text:.2f} Bilhões (R$)",
-        ]),
-    )
+    if dense:
+        fig.update_traces(  # Atualizando o traço do LinePlot (sem texto nos pontos)
+            hovertemplate="<br>Resultado das Operações: %{customdata[0]:.2f} Bilhões (R$)",
+        )
+    else:
+        fig.update_traces(  # Atualizando o traço do LinePlot
+            texttemplate="%{text:.2f} Bi",  # Template do infotext
+            hovertemplate="<br>".join([  # Template do hoverinfo
+                "<br>Resultado das Operações: %{text:.2f} Bilhões (R$)",
+            ]),
+        )
 
-    fig.update_layout(  # Atualizando as propriedades do Layout do Gráfico
-        height=480,  # Altura da figura
-        paper_bgcolor="white",  # Cor de fundo da figura
-        font=dict(
-                        family="BancoDoBrasil Textos",  # Fonte do texto
-                        color='#002D4B',  # Cor do texto
-        ),
-        hoverlabel=dict(  # Propriedades do hoverlabel
-            bordercolor='#002D4B',  # Cor da borda do hoverlabel
-            font=dict(
-                color='#002D4B',  # Cor do texto
-                size=12,  # Tamanho do texto
-                family="BancoDoBrasil Textos",  # Fonte do texto
-            ),
-            bgcolor="white",  # Cor de fundo do hoverlabel
-        ),
+    fig.update_layout(  # Propriedades do Layout próprias deste gráfico (as demais vêm do tema)
         hovermode="x unified",  # Modo de exibição do hoverinfo
-        title=dict(  # Propriedades do título do gráfico
-            font=dict(
-                size=20,  # Tamanho da fonte
-                color="#0D214F",  # Cor do texto
-                family="BancoDoBrasil Textos",  # Fonte do texto
-            ),
-            x=0.5,  # Posição do título no eixo X
-            y=0.95,  # Posição do título no eixo Y
-        ),
-        xaxis=dict(  # Propriedades do eixo X
-            title=dict(
-                font=dict(
-                    size=16,  # Tamanho da fonte
-                    color="#0D214F",  # Cor do texto
-                    family="BancoDoBrasil Textos",  # Fonte do texto
-                ),
-            )
-        ),
-        yaxis=dict(  # Propriedades do eixo Y
-            title=dict(
-                font=dict(
-                    size=16,  # Tamanho da fonte
-                    color="#0D214F",  # Cor do texto
-                    family="BancoDoBrasil Textos",  # Fonte do texto
-                ),
-            )
-        ),
-        legend=dict(  # Propriedades da legenda
-            bgcolor="rgba(0,0,0,0)",  # Cor de fundo da legenda
-            yanchor="top",  # Posição da legenda no eixo Y
-            y=0.99,  # Posição da legenda no eixo Y
-            xanchor="left",  # Posição da legenda no eixo X
-            x=1,  # Posição da legenda no eixo X
-            font=dict(  # Propriedades do texto da legenda
-                            size=11,  # Tamanho da fonte
-                            color="#0D214F",  # Cor do texto
-                            family="BancoDoBrasil Textos",  # Fonte do texto
-            ),
-            title=dict(  # Propriedades do título da legenda
-                text="INSTITUIÇÕES BANCÁRIAS",  # Texto do título
-                font=dict(  # Propriedades do texto do título
-                    size=13,  # Tamanho da fonte
-                    color="#0D214F",  # Cor da fonte
-                    family="BancoDoBrasil Textos",  # Familia da fonte
-                ),
-            ),
-        ),
+        legend_title_text="INSTITUIÇÕES BANCÁRIAS",  # Texto do título da legenda
         margin=dict(l=1,
                     r=30,
                     t=50,
                     b=5),  # Margem do Plot
-        transition_duration=1000,  # Tempo de transição na atulização do gráfico
     )
     return fig
 
 
-def update_pieplot(filtered_df):
+def bank_operations(filtered_df):
+    """Soma o número de operações por nome do banco"""
+    return filtered_df.groupby("NOME_BANCO")["TOTAL_N"].sum()
+
+
+# Participação mínima no total para um banco ter fatia própria no gráfico de pizza
+PIE_MIN_SHARE = 0.05
+
+# Número máximo de fatias de bancos no gráfico de pizza (None: sem limite)
+PIE_TOP_N = None
+
+
+def top_n_with_remainder(values, n=None, min_share=0.0, remainder_label="Outros"):
     """
-    Atualiza o plot de pizza com os dados filtrados.
+    Mantém as maiores entradas de uma série agregada (por exemplo, o total por banco) e soma as
+    demais em uma única entrada remainder_label, no final.
+    Uma entrada é mantida se a sua participação no total é de pelo menos min_share e se está
+    entre as n maiores (n=None: sem limite). As entradas mantidas seguem na ordem original, e o
+    resto só é incluído quando alguma entrada foi agrupada.
     """
-    # Somar todas as operações dos bancos filtrados
-    total = filtered_df["TOTAL_N"].sum()
+    total = values.sum()
+    # Participação de cada entrada (com total zero, nenhuma é agrupada por participação)
+    keep = ~((values / total) < min_share).to_numpy()
 
-    # Agrupar as operações por nome do banco
-    por_banco = filtered_df.groupby("NOME_BANCO")["TOTAL_N"].sum()
+    if n is not None and keep.sum() > n:
+        # Entre as entradas que passaram pela participação mínima, apenas as n maiores
+        # (em empates, a primeira na ordem original)
+        kept = np.flatnonzero(keep)
+        largest = kept[np.argsort(-values.to_numpy()[kept], kind="mergesort")[:n]]
+        keep = np.zeros(len(values), dtype=bool)
+        keep[largest] = True
 
-    # Selecionar bancos com operações menores que 5% do total
-    menor_5 = (por_banco / total) < 0.05
+    if keep.all():
+        return values
 
-    # Remover bancos com operações menores que 5% do total
-    maior_95 = filtered_df[filtered_df["NOME_BANCO"].isin(
-        por_banco[~menor_5].index)]
+    remainder = pd.Series([values[~keep].sum()], name=values.name,
+                          index=pd.Index([remainder_label], name=values.index.name))
+    return pd.concat([values[keep], remainder])
 
-    # Adicionar soma dos bancos com operações menores que 5% ao DataFrame como "Outros"
-    com_outros = pd.concat(
-        [
-            maior_95,  # DataFrame com bancos com operações maiores que 5% do total
-            pd.DataFrame(  # DataFrame com o total das operações dos bancos com menos de 5%
-                {
-                    # Soma das operações dos bancos com menos de 5%
-                    "TOTAL_N": [por_banco[menor_5].sum()],
-                    "NOME_BANCO": ["Outros"]  # Nome para o novo grupo
-                }
-            ),
-        ]
-    )
+
+def update_pieplot(filtered_df, por_banco=None, top_n=PIE_TOP_N, min_share=PIE_MIN_SHARE):
+    """
+    Atualiza o plot de pizza com os dados filtrados.
+    por_banco pode receber o resultado já calculado de bank_operations(filtered_df)
+    (ou do cubo de agregados, Cube.bank_totals)
+    """
+    # Agrupar as operações por nome do banco
+    if por_banco is None:
+        por_banco = bank_operations(filtered_df)
+
+    # Fatias: bancos com pelo menos min_share do total (e entre os top_n maiores) e a soma dos
+    # demais como "Outros", já agregados (uma linha por fatia)
+    com_outros = top_n_with_remainder(por_banco, top_n, min_share).rename_axis(
+        "NOME_BANCO").reset_index(name="TOTAL_N")
 
     # Cria uma figura com o tipo de gráfico pie chart a partir do dataframe com_outros
     fig = px.pie(
@@ -480,14 +1819,13 @@ def update_pieplot(filtered_df):
         color_discrete_map=bank_colors,
         # Lista com as colunas extras que serão exibidas ao passar o mouse sobre as fatias (info text)
         custom_data=["NOME_BANCO"],
+        # Tema dos gráficos (texto das fatias com o percentual e o rótulo, dentro das fatias)
+        template=FIGURE_TEMPLATE,
     )
 
-    # Define algumas configurações das fatias do gráfico
+    # Define o texto que aparece quando o mouse é posicionado sobre as fatias
     fig.update_traces(
-        textposition="inside",  # Posição do texto dentro das fatias
-        # Informações que serão exibidas no texto das fatias (percentual e rótulo)
-        textinfo="percent+label",
-        hovertemplate="<br>".join(  # Formato do texto que aparece quando o mouse é posicionado sobre as fatias
+        hovertemplate="<br>".join(
             [
                 # Coluna extra que será exibida no info text
                 "Instituição: %{customdata[0]}",
@@ -495,58 +1833,17 @@ def update_pieplot(filtered_df):
             ]
         ),
     )
-    # Define algumas configurações gerais do layout do gráfico
+    # Configurações do layout próprias deste gráfico (as demais vêm do tema)
     fig.update_layout(
         width=460,  # Largura da figura
-        height=480,  # Altura da figura
-        font=dict(  # Configurações da fonte
-            family="BancoDoBrasil Textos",  # Nome da fonte
-            color='#002D4B',  # Cor da fonte
-        ),
-        hoverlabel=dict(  # Configurações da caixa de texto que aparece ao passar o mouse sobre as fatias
-            bordercolor='#002D4B',  # Cor da borda da caixa
-            font=dict(  # Configurações da fonte da caixa
-                color='#002D4B',  # Cor da fonte
-                size=12,  # Tamanho da fonte
-                family="BancoDoBrasil Textos",  # Nome da fonte
-            ),
-            bgcolor="white",  # Cor de fundo da caixa
-        ),
-        paper_bgcolor="white",  # Cor de fundo da figura
-        title=dict(  # Configurações do título do gráfico
-            font=dict(
-                size=20,  # Tamanho da fonte
-                color="#0D214F",  # Cor da fonte
-                family="Arial",  # Nome da fonte
-            ),
-            x=0.5,  # Posição do título no eixo x (0 = esquerda, 1 = direita)
-            y=0.95,  # Posição do título no eixo y (0 = baixo, 1 = topo)
-        ),
-        xaxis=dict(  # Configuração para o eixo X
-            title=dict(  # Configuração para o título do eixo X
-                font=dict(  # Configuração para a fonte do título do eixo X
-                    size=16,  # Tamanho da fonte
-                    color="#0D214F",  # Cor da fonte em código hexadecimal
-                    family="Arial",  # Família da fonte
-                ),
-            )
-        ),
-        yaxis=dict(  # Configuração para o eixo Y
-            title=dict(  # Configuração para o título do eixo Y
-                font=dict(  # Configuração para a fonte do título do eixo Y
-                    size=16,  # Tamanho da fonte
-                    color="#0D214F",  # Cor da fonte em código hexadecimal
-                    family="Arial",  # Família da fonte
-                ),
-            )
-        ),
+        title_font_family="Arial",  # Fonte do título
         legend=dict(  # Configuração para a legenda
             orientation="h",  # Orientação horizontal
             yanchor="middle",  # Âncora vertical no meio
             y=-0.2,  # Posição vertical relativa à âncora
             xanchor="center",  # Âncora horizontal no centro
             x=0.5,  # Posição horizontal relativa à âncora
-            bgcolor="rgba(0,0,0,0)",  # Cor de fundo da legenda
+            font=dict(size=12, color='#002D4B'),  # Fonte da legenda (a mesma do texto)
         ),
         # Duração da transição na atualização do gráfico em milissegundos
         transition=dict(duration=1500),
@@ -554,8 +1851,16 @@ def update_pieplot(filtered_df):
     return fig
 
 
-def update_spread_lineplot(filtered_df):
-    """Função que cria um lineplot do spread com os filtros selecionados"""
+def update_spread_lineplot(filtered_df, render_mode=None):
+    """
+    Função que cria um lineplot do spread com os filtros selecionados
+    render_mode substitui o RENDER_MODE ("auto", "svg" ou "webgl")
+    """
+
+    # Com muitos pontos, as linhas são reduzidas e deixam de exibir o texto dos pontos
+    dense = len(filtered_df) > LINE_WEBGL_POINTS
+    webgl = use_webgl(len(filtered_df), render_mode)
+    filtered_df = downsample_lines(filtered_df, "SPREAD")
 
     # Criando a figura de Visualização com a biblioteca Plotly Express
     fig = px.line(
@@ -568,125 +1873,80 @@ def update_spread_lineplot(filtered_df):
             "SPREAD": "Spread",
         },
         # Selecionando quais dados extras serão mostrados em hover
-        custom_data=["NOME_BANCO"],
-        text="SPREAD",  # Selecionando quais valores aparecerão ao passar o mouse sobre as linhas
+        custom_data=None if dense else ["NOME_BANCO"],
+        # Selecionando quais valores aparecerão ao passar o mouse sobre as linhas
+        text=None if dense else "SPREAD",
         title="Spread Cambial (%)",  # Título do gráfico
         markers=True,  # Habilitando marcadores nos pontos da linha
         # Definindo uma paleta de cores pré-definida para cada banco
         color_discrete_map=bank_colors,
+        render_mode="webgl" if webgl else "svg",  # Scattergl ou Scatter
+        template=FIGURE_TEMPLATE,  # Tema dos gráficos (largura da linha e posição do texto)
     )
 
     fig.update_traces(  # Atualizando o traço do LinePlot
-        line=dict(width=1.8),  # Largura da linha do lineplot
-        textposition="bottom right",  # Posição do texto nos pontos do lineplot
-        texttemplate="%{y:.2f} %",  # Formato do texto nos pontos do lineplot
         hovertemplate="<br>".join(
             [
                 "Spread: %{y}%",  # Texto do hover nos pontos do lineplot
             ]
-        )
+        ),
+        # Formato do texto nos pontos do lineplot
+        **({} if dense else dict(texttemplate="%{y:.2f} %")),
     )
 
-    fig.update_layout(  # Estilizando a Visualização
-        height=480,  # Altura da figura
-        font=dict(
-            family="BancoDoBrasil Textos",  # Fonte do texto
-            color='#002D4B',  # Cor do texto
-        ),
-        paper_bgcolor="white",  # Cor do fundo da figura
-        # plot_bgcolor="#0D214F", # Cor no fundo do Plot
-        hoverlabel=dict(
-            bordercolor='#002D4B',  # Cor da borda do hover
-            font=dict(
-                color='#002D4B',  # Cor do texto do hover
-                size=12,  # Tamanho da fonte do hover
-                family="BancoDoBrasil Textos"  # Fonte do texto do hover
-            ),
-            bgcolor="white",  # Cor do fundo do hover
-        ),
+    fig.update_layout(  # Estilizando a Visualização (o restante vem do tema)
         hovermode="x unified",  # Modo do hover
-        title=dict(  # Titulo
-            font=dict(
-                size=20,  # Tamanho da fonte do titulo
-                color="#0D214F",  # Cor do titulo
-                family="BancoDoBrasil Textos",  # Fonte do titulo
-            ),
-            x=0.5,  # Posição do titulo no eixo X
-            y=0.95,  # Posição do titulo no eixo Y
-        ),
-        xaxis=dict(  # Eixo X
-            title=dict(
-                font=dict(
-                    size=16,  # Tamanho da fonte do titulo do eixo X
-                    color="#0D214F",  # Cor do titulo do eixo X
-                    family="BancoDoBrasil Textos",  # Fonte do titulo do eixo X
-                ),
-            )
-        ),
-        yaxis=dict(  # Eixo Y
-            title=dict(
-                font=dict(
-                    size=16,  # Tamanho da fonte do titulo do eixo Y
-                    color="#0D214F",  # Cor do titulo do eixo Y
-                    family="BancoDoBrasil Textos",  # Fonte do titulo do eixo Y
-                ),
-            )
-        ),
-        legend=dict(  # Legenda
-            bgcolor="rgba(0,0,0,0)",  # Cor de fundo da legenda
-            yanchor="top",  # Âncora da legenda no eixo Y
-            y=0.99,  # Posição da legenda no eixo Y
-            xanchor="left",  # Âncora da legenda no eixo X
-            x=1,  # Posição da legenda no eixo X
-            font=dict(  # Fonte da Legenda
-                size=11,  # Tamanho da fonte
-                color="#0D214F",  # Cor da fonte
-                family="BancoDoBrasil Textos",  # Familia da fonte
-            ),
-            title=dict(  # Titulo da Legenda
-                text="INSTITUIÇÕES BANCÁRIAS",  # String
-                font=dict(  # Fonte do Titulo da Leganda
-                    size=13,  # Tamanho da fonte
-                    color="#0D214F",  # Cor da fonte
-                    family="BancoDoBrasil Textos",  # Familia da fonte
-                ),
-            ),
-        ),
+        legend_title_text="INSTITUIÇÕES BANCÁRIAS",  # Titulo da Legenda
         margin=dict(l=1, r=30, t=50, b=5),
-        transition_duration=1000,  # Tempo de transição na atulização do gráfico
     )
     return fig
 
 
-def create_barplot(filtered_df):
-    """Cria um barplot dos valores trimestrais ou anuais usando os filtros"""
-
-    # Linhas onde o banco é o BB
-    bb = filtered_df[filtered_df["NOME_BANCO"] == "BB"]
+def market_totals(filtered_df):
+    """Soma os valores numéricos por Trimestre e ano"""
+    return filtered_df.groupby("ANO-TRIMESTRE").sum(numeric_only=True).reset_index()
 
-    # Somando os valores por Trimestre e ano
-    filtered_df = filtered_df.groupby("ANO-TRIMESTRE").sum().reset_index()
 
-    # Aplicando o nome mercado para o total
-    filtered_df["NOME_BANCO"] = "MERCADO"
+# Granularidades do gráfico de barras (trimestral é a padrão)
+BARPLOT_MODES = ("trimestral", "anual")
 
-    # Juntanto o BB com o Mercado
-    final_df = pd.concat([bb, filtered_df])
 
-    # Valor total do Mercado
-    total = final_df["TOTAL_VOL"].sum()
+def create_barplot(filtered_df, market_df=None, mode="trimestral", render_mode=None):
+    """
+    Cria um barplot dos valores trimestrais ou anuais usando os filtros
+    Apenas a granularidade pedida em mode ("trimestral" ou "anual") é calculada
+    market_df pode receber o resultado já calculado de market_totals(filtered_df)
+    (ou do cubo de agregados, Cube.market_totals); nesse caso basta que filtered_df
+    tenha as linhas do BB
+    render_mode substitui o RENDER_MODE na linha de participação do BB
+    """
 
-    # Pegando a porcentagem que o BB representa do Total
-    final_df.loc[final_df["NOME_BANCO"] == "BB", "PORCENTAGEM"] = (
-        final_df[final_df["NOME_BANCO"] == "BB"]["TOTAL_VOL"] / total
-    ) * 1000
+    # Linhas onde o banco é o BB (apenas as colunas usadas no gráfico)
+    bb = filtered_df.loc[filtered_df["NOME_BANCO"] == "BB", ["ANO-TRIMESTRE", "TOTAL_VOL"]]
 
-    final_df["TOTAL_VOL"] = final_df["TOTAL_VOL"] / 1000000
+    # Somando os valores por Trimestre e ano
+    if market_df is None:
+        market_df = market_totals(filtered_df)
+
+    # Valor total do BB e do Mercado
+    bb_vol = bb["TOTAL_VOL"].to_numpy()
+    market_vol = market_df["TOTAL_VOL"].to_numpy()
+    total = bb_vol.sum() + market_vol.sum()
+
+    # Juntanto o BB com o Mercado em um único dataframe, montado uma única vez:
+    # volume em bilhões e a porcentagem que o BB representa do Total
+    final_df = pd.DataFrame({
+        "NOME_BANCO": ["BB"] * len(bb) + ["MERCADO"] * len(market_df),
+        "ANO-TRIMESTRE": np.concatenate([bb["ANO-TRIMESTRE"].to_numpy(),
+                                         market_df["ANO-TRIMESTRE"].to_numpy()]),
+        "TOTAL_VOL": np.concatenate([bb_vol, market_vol]) / 1000000,
+        "PORCENTAGEM": np.concatenate([bb_vol / total * 1000,
+                                       np.full(len(market_vol), np.nan)]),
+    })
 
     def acumulado_ano(df):
-        # Adicionar coluna ANO ao DataFrame df
-
-        df["ANO"] = pd.to_datetime(df["ANO-TRIMESTRE"], format="%Y-%m").dt.year
+        # Adicionar coluna ANO a uma cópia do DataFrame df
+        df = df.assign(ANO=pd.to_datetime(df["ANO-TRIMESTRE"], format="%Y-%m").dt.year)
 
         # Agrupa os valores do "TOTAL_N" pela coluna "ANO" para o banco "BB"
         bb_total = df[df["NOME_BANCO"] == "BB"].groupby(
@@ -736,6 +1996,7 @@ def create_barplot(filtered_df):
             text="TOTAL_VOL",  # Define o texto exibido sobre as barras como o volume total de câmbio
             title="Volume de câmbio BB x Mercado",  # Define o título da figura
             color_discrete_map=bank_colors,  # Define a paleta de cores para cada banco
+            template=FIGURE_TEMPLATE,  # Tema dos gráficos (fonte branca do texto das barras)
         )
         fig.update_traces(  # Atualiza as propriedades das barras
             hovertemplate="<br>".join(  # Define o formato de exibição ao passar o mouse sobre as barras
@@ -749,20 +2010,13 @@ def create_barplot(filtered_df):
             ),
             # Define o formato do texto exibido sobre as barras como bilhões de dólares
             texttemplate="%{y:.2f} Bi USD",
-            textfont=dict(  # Define a fonte do texto exibido sobre as barras
-                # Define a família da fonte como "BancoDoBrasil Textos"
-                family="BancoDoBrasil Textos",
-                color="white"),  # Define a cor do texto como branco
-        )
-
-        fig.update_yaxes(  # Define o título e alinha o eixo y principal
-            secondary_y=False,
-            title_text="Volume de Câmbio"
         )
 
         # Adiciona um gráfico de linhas para a participação do BB
+        # (Scattergl ou Scatter, conforme o modo de renderização)
+        scatter = go.Scattergl if use_webgl(len(df), render_mode) else go.Scatter
         fig.add_trace(
-            go.Scatter(
+            scatter(
                 x=df[periodo],  # Define o eixo x com base no dropdown selecionado
                 # Define a participação do BB como valor de y
                 y=df["PORCENTAGEM"],
@@ -784,57 +2038,8 @@ def create_barplot(filtered_df):
             )
         )
 
-        fig.update_yaxes(
-            title_text="Participação BB em %",  # Define o título do eixo secundário
-            secondary_y=True,  # Define o eixo secundário como True
-            title=dict(
-                font=dict(
-                    size=16,  # Tamanho da fonte
-                    color="#0D214F",  # Cor da fonte
-                    family="BancoDoBrasil Textos",  # Familia da fonte
-                ),
-            ),
-        )
-
-        fig.update_layout(  # Atualizando o layout da figura
-            height=480,  # Definindo a altura da figura
-            paper_bgcolor="white",  # Definindo a cor de fundo da figura
-            hoverlabel=dict(  # Definindo a caixa de texto ao passar o mouse
-                bordercolor='#002D4B',  # Cor da borda da caixa
-                font=dict(  # Definindo a fonte da caixa
-                            color='#002D4B',  # Cor do texto da caixa
-                            size=12,  # Tamanho do texto da caixa
-                            family="BancoDoBrasil Textos"  # Fonte do texto da caixa
-                ),
-                bgcolor="white",  # Cor de fundo da caixa
-            ),
-            title=dict(  # Configurando o título
-                font=dict(
-                    size=20,  # Tamanho da fonte do título
-                    color="#0D214F",  # Cor do título
-                    family="BancoDoBrasil Textos",  # Fonte do título
-                ),
-                x=0.5,  # Posição do título no eixo X
-                y=0.95,  # Posição do título no eixo y
-            ),
-            xaxis=dict(  # Configurando o eixo X
-                title=dict(
-                    font=dict(
-                        size=16,  # Tamanho da fonte do título do eixo X
-                        color="#0D214F",  # Cor do título do eixo X
-                        family="BancoDoBrasil Textos",  # Fonte do título do eixo X
-                    ),
-                )
-            ),
-            yaxis=dict(  # Configurando o eixo Y principal
-                title=dict(
-                    font=dict(
-                        size=16,  # Tamanho da fonte do título do eixo Y
-                        color="#0D214F",  # Cor do título do eixo Y
-                        family="BancoDoBrasil Textos",  # Fonte do título do eixo Y
-                    ),
-                )
-            ),
+        fig.update_layout(  # Atualizando o layout da figura (o restante vem do tema)
+            yaxis_title_text="Volume de Câmbio",  # Título do eixo Y principal
             yaxis2=dict(  # Configurando o eixo Y secundário
                 title="Participação BB em %",  # Título do eixo Y secundário
                 title_font=dict(
@@ -849,154 +2054,440 @@ def create_barplot(filtered_df):
                 # Define o intervalo do eixo Y secundário
                 range=[0, 30],
             ),
-            legend=dict(  # Configurando a legenda
-                bgcolor="rgba(0,0,0,0)",  # Cor de fundo da legenda
-                yanchor="top",  # Âncora vertical da legenda
-                y=0.99,  # Posição vertical da legenda
-                xanchor="left",  # Âncora horizontal da legenda
-                x=1,  # Posição horizontal da legenda
-                font=dict(  # Fonte da Legenda
-                            size=11,  # Tamanho da fonte
-                            color="#0D214F",  # Cor da fonte
-                            family="BancoDoBrasil Textos",  # Familia da fonte
-                ),
-                title=dict(  # Titulo da Legenda
-                    font=dict(  # Fonte do Titulo da Leganda
-                                size=13,  # Tamanho da fonte
-                                color="#0D214F",  # Cor da fonte
-                                family="BancoDoBrasil Textos",  # Familia da fonte
-                    ),
-                ),
-            ),
             # Configurando as margens do gráfico
             margin=dict(l=1, r=90, t=50, b=5),
-            transition_duration=1000,  # Tempo de transição na atualização do gráfico
         )
         return fig
 
-    # Criando o dataFrame do acumulado por ano
-    total_df = acumulado_ano(final_df)
+    if mode == "anual":
+        # Grafico Anual, a partir do dataFrame do acumulado por ano
+        return fig(acumulado_ano(final_df), "ANO")
 
     # Grafico trimestral
-    fig1 = fig(final_df, "ANO-TRIMESTRE")
-    # Grafico Anual
-    fig2 = fig(total_df, "ANO")
+    return fig(final_df, "ANO-TRIMESTRE")
 
-    return fig1, fig2
 
-
-@app.callback(
-    # identificador da saída e o tipo de dado esperado
-    Output("bar-lineplot", "figure"),
+# Guarda o modo Anual ou Trimestral dependendo de qual botão for clicado (executado no navegador)
+app.clientside_callback(
+    """
+    function(trimestral_clicks, ano_clicks) {
+        const triggered = window.dash_clientside.callback_context.triggered;
+        if (triggered.length && triggered[0].prop_id === "ano-button.n_clicks") {
+            return "anual";
+        }
+        return "trimestral";
+    }
+    """,
+    # Modo ativo do gráfico de barras, guardado no navegador
+    Output("barplot-mode", "data"),
     [
-        # identificador do ano selecionado pelo usuário
-        Input("year-dropdown", "value"),
-        # identificador do trimestre selecionado pelo usuário
-        Input("quarter-dropdown", "value"),
-        # identificador do banco selecionado pelo usuário
-        Input("bank-dropdown", "value"),
         # identificador do número de cliques no botão trimestral
         Input("trimestral-button", "n_clicks"),
         # identificador do número de cliques no botão anual
         Input("ano-button", "n_clicks"),
     ],
+    prevent_initial_call=True,
 )
-def update_barplot(
-        selected_year, selected_quarter, selected_bank, trimestral_clicks, ano_clicks):
-    """
-    Função que retorna Anual ou Trimestral dependendo de qual botão for clicado
-    Recebe como entrada as opções selecionadas pelo usuário no dropdown
+
+
+# Exibe a figura do modo ativo entre as figuras já calculadas (executado no navegador)
+app.clientside_callback(
     """
+    function(figures, mode) {
+        if (!figures) {
+            return window.dash_clientside.no_update;
+        }
+        return figures[mode] || figures.trimestral;
+    }
+    """,
+    Output("bar-lineplot", "figure"),
+    [
+        # figuras dos dois modos, calculadas no servidor
+        Input("barplot-figures", "data"),
+        # modo ativo do gráfico (trimestral ou anual)
+        Input("barplot-mode", "data"),
+    ],
+)
+
 
-    # Filtra os dados de acordo com as opções selecionadas pelo usuário
-    filtered_df = filter_data(selected_year, selected_quarter, selected_bank)
+def layout_hash(figure):
+    """Hash do layout de uma figura (dict), para saber se o navegador já exibe o mesmo layout"""
+    return hashlib.md5(json.dumps(figure["layout"], sort_keys=True).encode()).hexdigest()
 
-    # Cria os gráficos de barra
-    fig1, fig2 = create_barplot(filtered_df)
 
-    # Obtém o contexto da chamada da função de callback
-    ctx = dash.callback_context
+def figure_update(figure, name, layouts):
+    """
+    Atualização da figura name enviada ao navegador
+    Se o layout exibido (hash em layouts) é o mesmo da nova figura, apenas os traços são
+    substituídos, com um Patch; caso contrário, a figura é enviada completa.
+    layouts recebe o hash do layout da nova figura
+    """
+    key = layout_hash(figure)
+    if layouts.get(name) == key:
+        patch = Patch()
+        patch["data"] = figure["data"]
+        return encode_patch(patch)
 
-    # Verifica qual botão foi clicado e retorna o gráfico apropriado
-    if ctx.triggered[0]["prop_id"] == "trimestral-button.n_clicks":
-        return fig1
-    elif ctx.triggered[0]["prop_id"] == "ano-button.n_clicks":
-        return fig2
-    return fig1
+    layouts[name] = key
+    return figure
 
 
 @app.callback(
     [
-        # Saída 1: gráfico de pizza
+        # Primeira página da tabela da seleção
+        Output('table', 'data'),
+        Output('table', 'page_count'),
+        Output('table', 'page_current'),
+        # Figuras trimestral e anual do gráfico de barras, guardadas no navegador
+        Output("barplot-figures", "data"),
+        # Gráfico de pizza e gráficos de linha
         Output("operations-result-pieplot", "figure"),
-        # Saída 2: gráfico de linha
         Output("spread-lineplot", "figure"),
-        # Saída 3: gráfico de linha
         Output("operations-result-lineplot", "figure"),
+        # Hash do layout de cada figura exibida
+        Output("figure-layouts", "data"),
+        # Seleção grande cujas figuras são criadas em segundo plano (build_figures)
+        Output("figure-job", "data"),
     ],
     [
-        # Entrada 1: dropdown com seleção do ano
+        # Dropdowns com a seleção do ano, do trimestre e do banco
         Input("year-dropdown", "value"),
-        # Entrada 2: dropdown com seleção do trimestre
         Input("quarter-dropdown", "value"),
-        # Entrada 3: dropdown com seleção do banco
         Input("bank-dropdown", "value"),
+        # Versão dos dados (atualiza tudo quando os dados são recarregados)
+        Input("data-version", "data"),
+    ],
+    [
+        # Ordenação, página e tamanho da página exibidos no DataTable
+        State('table', 'sort_by'),
+        State('table', 'page_current'),
+        State('table', 'page_size'),
+        # Hash do layout de cada figura já exibida no navegador
+        State("figure-layouts", "data"),
     ],
+    # A seleção inicial já vem preenchida no layout (serve_layout)
+    prevent_initial_call=True,
 )
-def update_plots(selected_year, selected_quarter, selected_bank):
+@instrument("update_selection")
+def update_selection(selected_year, selected_quarter, selected_bank, data_version,
+                     sort_by, page_current, page_size, layouts):
     """
-    Atualiza os gráficos baseados nos filtros escolhidos no dropdown
+    Atualiza a tabela e todos os gráficos quando a seleção dos dropdowns muda, em uma única
+    requisição (os dados são filtrados uma única vez para todas as saídas)
+    As figuras cujo layout o navegador já exibe são enviadas como Patch, apenas com os traços
+    As figuras de seleções grandes são criadas em segundo plano (build_figures)
+    A troca entre os gráficos Anual e Trimestral pelos botões é feita no navegador
     """
 
-    # Filtra o DataFrame com base nas opções selecionadas
-    filtered_df = filter_data(selected_year, selected_quarter, selected_bank)
+    # Normaliza as opções selecionadas (os dados só são filtrados se algo não estiver no cache)
+    selection = normalize_selection(selected_year, selected_quarter, selected_bank)
 
-    # Atualiza o gráfico de linha de resultados
-    line_plot = update_lineplot(filtered_df)
+    # Todas as saídas usam a mesma versão dos dados
+    data = dataset
 
-    # Atualiza o gráfico de pizza de número de operações
-    pie_plot = update_pieplot(filtered_df)
+    # Volta para a primeira página da tabela (sem alterar a página se já é a primeira, o que
+    # chamaria o update_table novamente)
+    records, page_count, _ = table_page(selection, 0, sort_by, page_size, data)
+    if not page_current:
+        page_current = dash.no_update
+    else:
+        page_current = 0
 
-    # Atualiza o gráfico de linha de spread
-    spread_line_plot = update_spread_lineplot(filtered_df)
+    # Seleções grandes ainda fora do cache têm as figuras criadas em segundo plano: as figuras
+    # exibidas são mantidas até o build_figures terminar (a versão dos dados faz a mesma
+    # seleção ser pedida de novo quando os dados mudam)
+    if is_heavy(selection, data):
+        return (records, page_count, page_current) + (dash.no_update,) * 5 + (
+            {"selection": [list(values) for values in selection], "version": data.version},)
 
-    # Retorna as figuras dos gráficos
-    return pie_plot, spread_line_plot, line_plot
+    return (records, page_count, page_current) + selection_figures(selection, layouts, data) + (
+        dash.no_update,)
 
 
-@app.callback(
+# Nomes das figuras de cada seleção no cache de figuras
+FIGURE_NAMES = [f"barplot_{mode}" for mode in BARPLOT_MODES] + [
+    "pieplot", "spread_lineplot", "lineplot"]
+
+
+def is_heavy(selection, data):
+    """Se as figuras da seleção devem ser criadas em segundo plano (muitas linhas, fora do cache)"""
+    if background_manager is None:
+        return False
+    if all((data.version, name, selection) in figure_cache for name in FIGURE_NAMES):
+        return False
+    return len(cached_filter_data(selection, data)) > BACKGROUND_ROWS
+
+
+def figure_builders(selection, data):
+    """
+    Funções que criam cada figura da seleção (FIGURE_NAMES), sem os caches de figuras: para
+    cada nome, a função da figura e uma função que obtém os seus argumentos (do cubo e dos
+    dados filtrados da seleção em cache)
+    """
+    builders = {
+        # Gráficos de barras dos dois modos, a partir do BB e do total do mercado no cubo
+        f"barplot_{mode}": (create_barplot, lambda mode=mode: (
+            data.cube.bank_rows(selection, "BB"),
+            data.cube.market_totals(selection),
+            mode))
+        for mode in BARPLOT_MODES
+    }
+    # Gráfico de pizza de número de operações
+    builders["pieplot"] = (update_pieplot, lambda: (
+        cached_filter_data(selection, data),
+        data.cube.bank_totals(selection, "TOTAL_N")))
+    # Gráfico de linha de spread
+    builders["spread_lineplot"] = (update_spread_lineplot, lambda: (
+        cached_filter_data(selection, data),))
+    # Gráfico de linha de resultados
+    builders["lineplot"] = (update_lineplot, lambda: (cached_filter_data(selection, data),))
+    return builders
+
+
+def build_figure_json(function, args):
+    """JSON da figura function(*args), criada em um processo do pool"""
+    return function(*args).to_json()
+
+
+def pool_figures(pool, selection, data):
+    """
+    Cria e serializa em paralelo, nos processos do pool, as figuras da seleção fora do cache
+    Os argumentos de cada figura são obtidos aqui e enviados com a tarefa: os processos não
+    precisam de uma cópia do dataset, nem de recebê-lo de novo quando os dados mudam
+    O JSON de cada figura é guardado no cache de figuras; as que falharem são criadas depois
+    na própria thread (cached_figure)
+    """
+    try:
+        futures = {
+            name: pool.submit(build_figure_json, function, args())
+            for name, (function, args) in figure_builders(selection, data).items()
+            if (data.version, name, selection) not in figure_cache
+        }
+        with stage("figure_pool"):
+            for name, future in futures.items():
+                try:
+                    figure_cache.get_or_create((data.version, name, selection), future.result)
+                except BrokenProcessPool:
+                    raise
+                except Exception:
+                    logger.exception("Falha ao criar a figura %s no pool de figuras", name)
+    except BrokenProcessPool:
+        # Um processo do pool foi encerrado (ex.: falta de memória). O pool não é recriado aqui,
+        # fora da thread principal: as figuras passam a ser criadas na thread da requisição
+        logger.exception("Pool de figuras interrompido; pool desativado neste worker")
+        stop_figure_pool(pool)
+
+
+def selection_figures(selection, layouts, data, progress=None):
+    """
+    Atualizações das figuras da seleção: figuras do gráfico de barras (Store), pizza, linha de
+    spread, linha de resultados e o hash dos layouts exibidos (ver figure_update)
+    Com o pool de figuras, as figuras fora do cache são criadas em paralelo nos seus processos
+    progress(n) é chamado a cada figura criada, se informado
+    """
+    layouts = dict(layouts or {})
+    done = count(1)
+    builders = figure_builders(selection, data)
+
+    pool = figure_pool()
+    if pool is not None:
+        pool_figures(pool, selection, data)
+
+    def build(name):
+        function, args = builders[name]
+        figure = cached_figure(selection, name, lambda: function(*args()), data)
+        if progress is not None:
+            progress(next(done))
+        return figure
+
+    barplots = {mode: build(f"barplot_{mode}") for mode in BARPLOT_MODES}
+    # Os dois modos ficam no mesmo Store: com os layouts já exibidos, apenas os traços mudam
+    barplot_keys = {f"barplot_{mode}": layout_hash(figure) for mode, figure in barplots.items()}
+    if all(layouts.get(name) == key for name, key in barplot_keys.items()):
+        barplot_figures = Patch()
+        for mode, figure in barplots.items():
+            barplot_figures[mode]["data"] = figure["data"]
+        barplot_figures = encode_patch(barplot_figures)
+    else:
+        barplot_figures = barplots
+        layouts.update(barplot_keys)
+
+    return (
+        barplot_figures,
+        figure_update(build("pieplot"), "pieplot", layouts),
+        figure_update(build("spread_lineplot"), "spread_lineplot", layouts),
+        figure_update(build("lineplot"), "lineplot", layouts),
+        layouts,
+    )
+
+
+def build_figures(set_progress, job, layouts):
+    """
+    Cria, em segundo plano, as figuras de uma seleção grande pedida pelo update_selection
+    O andamento é exibido na barra de progresso, e o processo é encerrado se a seleção mudar
+    """
+    selection = normalize_selection(*job["selection"])
+    set_progress(("0", str(len(FIGURE_NAMES))))
+    return selection_figures(selection, layouts, dataset,
+                             lambda done: set_progress((str(done), str(len(FIGURE_NAMES)))))
+
+
+if background_manager is not None:
+    app.callback(
+        [
+            # As mesmas figuras do update_selection
+            Output("barplot-figures", "data", allow_duplicate=True),
+            Output("operations-result-pieplot", "figure", allow_duplicate=True),
+            Output("spread-lineplot", "figure", allow_duplicate=True),
+            Output("operations-result-lineplot", "figure", allow_duplicate=True),
+            Output("figure-layouts", "data", allow_duplicate=True),
+        ],
+        # Seleção grande enviada pelo update_selection
+        [Input("figure-job", "data")],
+        # Hash do layout de cada figura já exibida no navegador
+        [State("figure-layouts", "data")],
+        background=True,
+        manager=background_manager,
+        interval=BACKGROUND_POLL_MS,
+        # Barra de progresso: figuras criadas e total, visível enquanto o processo executa
+        progress=[Output("figures-progress", "value"), Output("figures-progress", "max")],
+        running=[(Output("figures-progress", "hidden"), False, True)],
+        # Uma nova seleção encerra o processo em andamento
+        cancel=[Input("year-dropdown", "value"), Input("quarter-dropdown", "value"),
+                Input("bank-dropdown", "value")],
+        prevent_initial_call=True,
+    )(instrument("build_figures")(build_figures))
+
+
+# Seleciona todos os bancos nos cliques ímpares e limpa a seleção nos pares (executado no navegador)
+app.clientside_callback(
+    """
+    function(n_clicks, feature_options) {
+        // Não atualiza o dropdown no início da aplicação
+        if (!n_clicks) {
+            return window.dash_clientside.no_update;
+        }
+        // Limpa todas as opções do dropdown nos cliques pares
+        if (n_clicks % 2 === 0) {
+            return [];
+        }
+        // Seleciona todas as opções do dropdown nos cliques ímpares
+        return (feature_options || []).map(function(option) { return option.value; });
+    }
+    """,
     # Saída da função, atualiza o valor do dropdown
     Output('bank-dropdown', 'value'),
     # Entrada da função, cliques no botão "Selecionar Todos"
     [Input('select_all', 'n_clicks')],
     # Estado da função, opções do dropdown
-    [State('bank-dropdown', 'options')]
+    [State('bank-dropdown', 'options')],
+    prevent_initial_call=True,
 )
-def update_dropdown(n_clicks, feature_options):
 
-    ctx = dash.callback_context  # Obtém o contexto da chamada da callback
 
-    # Verifica se a callback foi disparada
-    if not ctx.triggered:
+@app.callback(
+    [
+        # Opções dos dropdowns de ano, trimestre e banco
+        Output("year-dropdown", "options"),
+        Output("quarter-dropdown", "options"),
+        Output("bank-dropdown", "options"),
+        # Versão dos dados exibida na página
+        Output("data-version", "data"),
+    ],
+    # Verificação periódica de uma nova versão dos dados
+    [Input("data-interval", "n_intervals")],
+    [State("data-version", "data")],
+)
+@instrument("update_options")
+def update_options(n_intervals, data_version):
+    """Atualiza as opções dos dropdowns quando uma nova versão dos dados é carregada"""
+    data = dataset
+
+    # Nada muda enquanto a versão exibida for a atual
+    if data_version == data.version:
         raise PreventUpdate()
-    else:
-        trigged_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
-        # Verifica se o botão "Selecionar Todos" foi clicado
-        if trigged_id == 'select_all':
+    return dropdown_options(data) + (data.version,)
 
-            # Não atualiza o dropdown no início da aplicação
-            if n_clicks == 0:
-                raise PreventUpdate()
 
-            # Limpa todas as opções do dropdown nos cliques pares
-            if n_clicks % 2 == 0:
-                return []
-            else:  # Seleciona todas as opções do dropdown nos cliques ímpares
-                return [i['value'] for i in feature_options]
-        else:
-            raise PreventUpdate()  # Não atualiza o dropdown em caso de outras entradas
+def dropdown_options(data):
+    """Opções dos dropdowns de ano, trimestre e banco"""
+    return (
+        [{"label": year, "value": year} for year in data.years],
+        [{"label": quarter, "value": quarter} for quarter in data.quarters],
+        [{"label": bank, "value": bank} for bank in data.banks],
+    )
+
+
+# Seleções frequentes pré-calculadas junto com a inicial, em JSON: uma lista de objetos com
+# "year", "quarter" e "bank" (os valores ausentes são os da seleção inicial)
+# Ex.: DASH_WARMUP_SELECTIONS='[{"bank": ["BB"]}, {"bank": ["BB", "CAIXA"], "quarter": ["12"]}]'
+WARMUP_SELECTIONS = json.loads(os.environ.get("DASH_WARMUP_SELECTIONS", "[]"))
+
 
+def default_selection(data):
+    """Seleção normalizada dos valores iniciais dos dropdowns"""
+    return normalize_selection(data.years.tolist(), DEFAULT_QUARTERS, DEFAULT_BANKS)
 
-if __name__ == "__main__":  # Iniciando o o Dashboard
-    app.run_server(debug=True)  # Ativando o debugmode
+
+def warmup_selections(data):
+    """Seleção inicial e seleções frequentes (WARMUP_SELECTIONS), sem repetições"""
+    year, quarter, bank = default_selection(data)
+    selections = [(year, quarter, bank)] + [
+        normalize_selection(values.get("year", list(year)), values.get("quarter", list(quarter)),
+                            values.get("bank", list(bank)))
+        for values in WARMUP_SELECTIONS
+    ]
+    return list(dict.fromkeys(selections))
+
+
+def warm_up(data=None):
+    """
+    Pré-calcula nos caches os dados filtrados, a primeira página da tabela e as figuras da
+    seleção inicial e das seleções frequentes, para que nenhum usuário espere por eles
+    Executado na importação (com preload_app, os workers herdam os caches) e a cada novo dataset
+    """
+    data = data or dataset
+    start = time.perf_counter()
+    selections = warmup_selections(data)
+    # As etapas do aquecimento são registradas à parte das dos callbacks
+    previous = getattr(metrics_context, "callback", None)
+    metrics_context.callback = "warmup"
+    try:
+        for selection in selections:
+            table_page(selection, 0, TABLE_SORT_BY, TABLE_PAGE_SIZE, data)
+            selection_figures(selection, {}, data)
+    finally:
+        metrics_context.callback = previous
+    logger.info("%d seleções pré-calculadas para os dados %s em %.2f s",
+                len(selections), data.version, time.perf_counter() - start)
+
+
+def initial_values(data):
+    """Tabela, figuras e hashes dos layouts da seleção inicial, incluídos no layout da página"""
+    selection = default_selection(data)
+    records, page_count, _ = table_page(selection, 0, TABLE_SORT_BY, TABLE_PAGE_SIZE, data)
+    barplot_figures, pieplot, spread_lineplot, lineplot, layouts = selection_figures(
+        selection, {}, data)
+    return {
+        "records": records,
+        "page_count": page_count,
+        "barplot_figures": barplot_figures,
+        "pieplot": pieplot,
+        "spread_lineplot": spread_lineplot,
+        "lineplot": lineplot,
+        "layouts": layouts,
+    }
+
+
+warm_up()
+
+# O Dash chama serve_layout já na atribuição, que usa as figuras pré-calculadas no warm_up
+app.layout = serve_layout
+
+
+if __name__ == "__main__":  # Iniciando o o Dashboard (servidor de desenvolvimento)
+    start_figure_pool()  # Processos das figuras (DASH_FIGURE_PROCESSES), antes das threads
+    start_data_watcher()  # Incorpora novos trimestres colocados em data/incoming
+    # O debugmode só é ativado com DASH_DEBUG=1
+    app.run_server(debug=os.environ.get("DASH_DEBUG", "0") == "1")
@@ -0,0 +1 @@
+"""Benchmarks do dashboard (execute a partir da raiz do repositório com python -m)"""
@@ -0,0 +1,94 @@
+"""
+Tempo total do callback update_selection em função da quantidade de processos do pool de figuras
+
+Para cada tamanho do pool (0 = sem pool, as figuras criadas uma após a outra na thread da
+requisição), o callback é chamado pelo servidor Flask, sem navegador, com as seleções "padrão"
+(principais bancos) e "todos" (todos os bancos) de um dataset sintético. Cada medição começa
+com os caches vazios e com um pool novo. As figuras são sempre criadas na requisição, sem os
+callbacks em segundo plano.
+
+Uso: python -m benchmarks.bench_figure_pool [--processes 0,1,2,4] [--banks N] [--years N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import timeit
+
+import app
+from benchmarks.common import synchronous_figures
+from benchmarks.load_test import callback_requests, component_values
+from benchmarks.synthetic import MAIN_BANKS, write_spread_csv
+
+
+def selection_request(client, bank):
+    """Corpo da requisição do update_selection com os bancos em bank"""
+    values = component_values(client.get("/_dash-layout").get_json())
+    values[("bank-dropdown", "value")] = bank
+    requests = callback_requests(client.get("/_dash-dependencies").get_json(), values)
+    for output, body in requests.items():
+        if app.app.callback_map[output]["callback"].__name__ == "update_selection":
+            return body
+    raise LookupError("update_selection não encontrado")
+
+
+def callback_times(client, body, repeat):
+    """Menor tempo e mediana (ms) do callback, com caches vazios e um pool novo a cada chamada"""
+    def setup():
+        app.selection_cache.clear()
+        app.figure_cache.clear()
+        app.start_figure_pool()
+
+    def call():
+        response = client.post("/_dash-update-component", data=body,
+                               content_type="application/json")
+        assert response.status_code == 200, response.status_code
+
+    times = timeit.repeat(call, setup=setup, repeat=repeat, number=1)
+    return min(times) * 1000, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cores = os.cpu_count() or 1
+    default = sorted({0, 1, 2, 4, cores} - {n for n in (2, 4) if n > cores})
+    parser.add_argument("--processes", default=",".join(map(str, default)),
+                        help="tamanhos do pool separados por vírgula")
+    parser.add_argument("--banks", type=int, default=760)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    synchronous_figures(app)
+    original = app.dataset
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_spread_csv(os.path.join(tmp, "spread.csv"),
+                                    n_banks=args.banks, n_years=args.years)
+            data = app.Dataset(app.read_csv(path), "bench-figure-pool")
+            app.swap_dataset(data)
+
+            client = app.server.test_client()
+            bodies = {"padrão": selection_request(client, MAIN_BANKS),
+                      "todos": selection_request(client, list(data.banks))}
+
+            print(f"{len(data.df)} linhas, {cores} CPUs")
+            print(f"{'processos':>9} " + " ".join(
+                f"{name + ' mín (ms)':>17} {'mediana (ms)':>13}" for name in bodies))
+            baseline = {}
+            for processes in map(int, args.processes.split(",")):
+                app.FIGURE_PROCESSES = processes
+                times = {name: callback_times(client, body, args.repeat)
+                         for name, body in bodies.items()}
+                baseline = baseline or times
+                print(f"{processes:>9} " + " ".join(
+                    f"{low:>17.1f} {median:>13.1f}" for low, median in times.values())
+                    + "  " + " ".join(f"{baseline[name][0] / times[name][0]:.2f}x"
+                                      for name in bodies))
+    finally:
+        app.FIGURE_PROCESSES = 0
+        app.swap_dataset(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compara o tempo de criação das figuras entre o app.py atual e o de uma revisão anterior
+
+Cada versão é medida em um processo separado (o app.py da revisão é extraído com git show
+para uma pasta temporária e importado no lugar do atual), com os dados do data/spread.csv e
+as seleções "padrão" (principais bancos) e "todos" (todos os bancos). As funções de gráfico
+são chamadas diretamente, sem os caches de figuras.
+
+Uso: python -m benchmarks.bench_figures [--baseline REVISÃO] [--repeat N]
+(sem --baseline, a comparação é com o último commit antes do template das figuras)
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import bench, worker_output
+from benchmarks.synthetic import MAIN_BANKS
+
+
+def load_app(path):
+    """Importa o app.py em path como o módulo app"""
+    spec = importlib.util.spec_from_file_location("app", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["app"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def figure_timings(app, repeat):
+    """Tempos (ms) de cada função de gráfico para as seleções padrão e com todos os bancos"""
+    data = app.dataset
+    selections = {"padrão": MAIN_BANKS, "todos": list(data.banks)}
+
+    def timed(func):
+        return bench(func, repeat, number=5, warmup=True)
+
+    timings = {}
+    for name, bank in selections.items():
+        selection = app.normalize_selection(list(data.years), list(data.quarters), bank)
+        filtered_df = app.cached_filter_data(selection, data)
+        bank_totals = data.cube.bank_totals(selection)
+        bb_rows = data.cube.bank_rows(selection, "BB")
+        market = data.cube.market_totals(selection)
+
+        timings[f"update_lineplot[{name}]"] = timed(
+            lambda: app.update_lineplot(filtered_df))
+        timings[f"update_spread_lineplot[{name}]"] = timed(
+            lambda: app.update_spread_lineplot(filtered_df))
+        timings[f"update_pieplot[{name}]"] = timed(
+            lambda: app.update_pieplot(filtered_df, bank_totals))
+        for mode in ("trimestral", "anual"):
+            timings[f"create_barplot[{mode}, {name}]"] = timed(
+                lambda: app.create_barplot(bb_rows, market, mode))
+    return timings
+
+
+def template_baseline():
+    """
+    Revisão anterior ao commit que criou o template de estilo das figuras (o primeiro que
+    define FIGURE_TEMPLATE no app.py), procurada no histórico a cada execução
+    """
+    def git(*args):
+        return subprocess.run(["git", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              universal_newlines=True, check=True).stdout.split()
+
+    commits = git("log", "--format=%H", "--reverse", "-S", "FIGURE_TEMPLATE =", "--", "app.py")
+    if not commits:
+        raise SystemExit("template das figuras não encontrado no histórico; use --baseline")
+    return git("rev-parse", "--short", f"{commits[0]}~1")[0]
+
+
+def run_worker(path, repeat):
+    """Mede os tempos do app.py em path em um novo processo"""
+    return worker_output(["benchmarks.bench_figures", "--worker", path, "--repeat", str(repeat)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline",
+                        help="revisão de comparação (padrão: antes do template das figuras)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(figure_timings(load_app(args.worker), args.repeat)))
+        return
+    args.baseline = args.baseline or template_baseline()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_path = os.path.join(tmp, "app.py")
+        with open(baseline_path, "wb") as file:
+            file.write(subprocess.run(["git", "show", f"{args.baseline}:app.py"],
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                      check=True).stdout)
+        before = run_worker(baseline_path, args.repeat)
+    after = run_worker(os.path.abspath("app.py"), args.repeat)
+
+    print(f"{'figura':<42} {args.baseline + ' (ms)':>16} {'atual (ms)':>11} {'ganho':>7}")
+    for name, timing in after.items():
+        if name in before:
+            print(f"{name:<42} {before[name]:>16.2f} {timing:>11.2f} "
+                  f"{before[name] / timing:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
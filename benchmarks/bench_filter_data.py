@@ -0,0 +1,48 @@
+"""
+Compara o filter_data com índice contra o caminho com máscaras booleanas (isin)
+
+Uso: python -m benchmarks.bench_filter_data
+"""
+import os
+import tempfile
+
+import app
+from benchmarks.common import bench
+from benchmarks.synthetic import MAIN_BANKS, write_spread_csv
+
+# (bancos, anos) de cada tamanho de dataset
+SIZES = [(76, 3), (760, 10), (3800, 20), (7600, 40)]
+
+
+def main():
+    print(f"{'linhas':>10} {'seleção':>10} {'máscara (ms)':>14} {'índice (ms)':>13} {'ganho':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_banks, n_years in SIZES:
+            path = write_spread_csv(os.path.join(tmp, "spread.csv"),
+                                    n_banks=n_banks, n_years=n_years)
+            df = app.read_csv(path)
+            index = app.FilterIndex(df)
+
+            years = list(df["ANO"].unique())
+            quarters = ["03", "06", "09", "12"]
+            selections = {
+                "padrão": (years, quarters, MAIN_BANKS),
+                "1 ano": ([years[-1]], quarters, MAIN_BANKS),
+                "todos": (years, quarters, list(df["NOME_BANCO"].unique())),
+            }
+
+            for name, (year, quarter, bank) in selections.items():
+                # Os dois caminhos precisam devolver as mesmas linhas
+                assert app.filter_data(year, quarter, bank, df, index).index.equals(
+                    app.filter_data(year, quarter, bank, df, None).index)
+
+                number = 2 if name == "todos" else 20
+                mask = bench(lambda: app.filter_data(year, quarter, bank, df, None),
+                             number=number)
+                indexed = bench(lambda: app.filter_data(year, quarter, bank, df, index),
+                                number=number)
+                print(f"{len(df):>10} {name:>10} {mask:>14.3f} {indexed:>13.3f} {mask / indexed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compara o tamanho e o tempo de serialização das respostas do update_selection entre os modos
+de DASH_JSON_ENGINE ("plotly", o padrão, e "orjson")
+
+Cada modo é medido em um processo separado (o modo é lido na importação do app.py), com as
+seleções "padrão" (principais bancos) e "todos" (todos os bancos), nas duas formas da resposta:
+"completa" (primeira exibição, com as figuras inteiras) e "patch" (layouts já exibidos, apenas
+os traços). São medidos o corpo do callback com as figuras já no cache (a leitura do JSON das
+figuras é a maior parte dele), a serialização da resposta pelo Dash (encode) e o tamanho da
+resposta. As figuras são sempre criadas na requisição, sem os callbacks em segundo plano.
+
+Uso: python -m benchmarks.bench_json [--banks N --years N] [--repeat N]
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.common import bench, synchronous_figures, worker_output
+from benchmarks.synthetic import MAIN_BANKS, write_spread_csv
+
+
+def response_timings(repeat):
+    """Tempos e tamanhos das respostas do update_selection no modo do processo atual"""
+    import dash
+    from dash._utils import to_json
+
+    import app
+
+    synchronous_figures(app)
+    data = app.dataset
+    year, quarter = data.years.tolist(), app.DEFAULT_QUARTERS
+    selections = {"padrão": MAIN_BANKS, "todos": data.banks.tolist()}
+
+    def response(bank, layouts):
+        # Resposta no formato montado pelo Dash, sem as saídas não alteradas
+        values = app.update_selection(year, quarter, bank, data.version, app.TABLE_SORT_BY,
+                                      0, app.TABLE_PAGE_SIZE, layouts)
+        return {"multi": True, "response": {
+            f"output-{i}": {"value": value} for i, value in enumerate(values)
+            if value is not dash.no_update}}
+
+    timings = {}
+    for name, bank in selections.items():
+        layouts = response(bank, {})["response"]["output-7"]["value"]
+        for kind, shown in (("completa", {}), ("patch", layouts)):
+            body = response(bank, shown)
+            encoded = to_json(body)
+            timings[f"{name}, {kind}"] = {
+                "callback_ms": bench(lambda: response(bank, shown), repeat, number=20, warmup=True),
+                "encode_ms": bench(lambda: to_json(body), repeat, number=20, warmup=True),
+                "bytes": len(encoded.encode()),
+                # Conteúdo decodificado, para verificar que os dois modos enviam o mesmo
+                "content": json.loads(encoded),
+            }
+    return timings
+
+
+def run_worker(engine, repeat, env):
+    """Mede as respostas com DASH_JSON_ENGINE=engine em um novo processo"""
+    # A ordem das flags dos traços (ex.: mode="lines+markers") depende do hash das strings:
+    # a mesma semente nos dois processos permite comparar o conteúdo das respostas
+    env = {**env, "DASH_JSON_ENGINE": engine, "PYTHONHASHSEED": "0"}
+    return worker_output(["benchmarks.bench_json", "--worker", "--repeat", str(repeat)], env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--banks", type=int, help="bancos do dataset sintético")
+    parser.add_argument("--years", type=int, default=3, help="anos do dataset sintético")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(response_timings(args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        if args.banks:
+            # O app lê os dados de data/spread.csv: o sintético é usado a partir de outra pasta
+            os.makedirs(os.path.join(tmp, "data"))
+            write_spread_csv(os.path.join(tmp, "data", "spread.csv"),
+                             n_banks=args.banks, n_years=args.years)
+            env["PYTHONPATH"] = os.pathsep.join([os.getcwd(), env.get("PYTHONPATH", "")])
+            os.chdir(tmp)
+        before = run_worker("plotly", args.repeat, env)
+        after = run_worker("orjson", args.repeat, env)
+
+    print(f"{'resposta':<20} {'callback plotly':>17} {'orjson':>8} {'encode plotly':>14} "
+          f"{'orjson':>8} {'bytes plotly':>13} {'orjson':>8} {'ganho':>7}")
+    for name, timing in after.items():
+        base = before[name]
+        same = "" if base["content"] == timing["content"] else "  <-- conteúdo diferente"
+        total = (base["callback_ms"] + base["encode_ms"]) / (
+            timing["callback_ms"] + timing["encode_ms"])
+        print(f"{name:<20} {base['callback_ms']:>17.2f} {timing['callback_ms']:>8.2f} "
+              f"{base['encode_ms']:>14.2f} {timing['encode_ms']:>8.2f} "
+              f"{base['bytes']:>13} {timing['bytes']:>8} {total:>6.2f}x{same}")
+
+
+if __name__ == "__main__":
+    main()
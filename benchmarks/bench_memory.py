@@ -0,0 +1,101 @@
+"""
+Pico de memória alocada (tracemalloc) por callback e por etapa do pipeline em um dataset grande
+
+Cada medição começa com os caches vazios, para que a filtragem e as figuras sejam
+calculadas de novo (depois de uma chamada sem medição, que faz as importações sob demanda). A seleção "todos" (todos os bancos) é o pior caso: a filtragem
+devolve todas as linhas do dataset.
+
+Uso: python -m benchmarks.bench_memory [--banks N] [--years N]
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import app
+from benchmarks.common import synchronous_figures
+from benchmarks.load_test import component_values, measured_requests
+from benchmarks.synthetic import MAIN_BANKS, write_spread_csv
+
+
+def peak_mb(func):
+    """Pico de memória (MB) alocada durante uma chamada de func, com os caches vazios"""
+    # Uma chamada sem medição antes, para não contar as importações feitas sob demanda
+    func()
+
+    app.selection_cache.clear()
+    app.figure_cache.clear()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def pipeline_peaks(data, year, quarter, bank):
+    """Pico de memória de cada etapa do pipeline para a seleção"""
+    selection = app.normalize_selection(year, quarter, bank)
+    filtered_df = app.filter_data(year, quarter, bank, data.df, data.index)
+    return {
+        "filter_data": peak_mb(lambda: app.cached_filter_data(selection, data)),
+        "table_page": peak_mb(lambda: app.table_page(selection, 0, app.TABLE_SORT_BY,
+                                                     data=data)),
+        "create_barplot": peak_mb(lambda: app.create_barplot(
+            data.cube.bank_rows(selection, "BB"), data.cube.market_totals(selection))),
+        "update_pieplot": peak_mb(lambda: app.update_pieplot(
+            filtered_df, data.cube.bank_totals(selection))),
+        "update_lineplot": peak_mb(lambda: app.update_lineplot(filtered_df)),
+        "update_spread_lineplot": peak_mb(lambda: app.update_spread_lineplot(filtered_df)),
+    }
+
+
+def callback_peaks(bank):
+    """
+    Pico de memória de cada callback completo (corpo e serialização) para os bancos em bank,
+    sem os callbacks em segundo plano e os que não alteram nada (ver measured_requests)
+    """
+    client = app.server.test_client()
+    values = component_values(client.get("/_dash-layout").get_json())
+    values[("bank-dropdown", "value")] = bank
+    requests = measured_requests(client, values)
+
+    peaks = {}
+    for output, body in requests.items():
+        name = app.app.callback_map[output]["callback"].__name__
+        peaks[f"callback:{name}"] = peak_mb(lambda: client.post(
+            "/_dash-update-component", data=body, content_type="application/json"))
+    return peaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--banks", type=int, default=760)
+    parser.add_argument("--years", type=int, default=30)
+    args = parser.parse_args()
+
+    synchronous_figures(app)
+    original = app.dataset
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_spread_csv(os.path.join(tmp, "spread.csv"),
+                                    n_banks=args.banks, n_years=args.years)
+            data = app.Dataset(app.read_csv(path), "bench-memory")
+            app.swap_dataset(data)
+
+            year, quarter = list(data.years), list(data.quarters)
+            selections = {"padrão": MAIN_BANKS, "todos": list(data.banks)}
+
+            print(f"{len(data.df)} linhas")
+            print(f"{'etapa':<32} " + " ".join(f"{name + ' (MB)':>14}" for name in selections))
+            peaks = {name: {**pipeline_peaks(data, year, quarter, bank), **callback_peaks(bank)}
+                     for name, bank in selections.items()}
+            for step in peaks["padrão"]:
+                print(f"{step:<32} " + " ".join(f"{peaks[name][step]:>14.1f}" for name in selections))
+    finally:
+        app.swap_dataset(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Tempo da formatação da tabela (update_table) para 10 mil, 100 mil e 1 milhão de linhas
+
+Compara a formatação antiga (três .apply com f-strings e atribuição com .loc),
+a conversão vetorizada de todas as linhas (format_table) e o caminho atual do
+callback, que ordena a seleção e formata apenas a página visível.
+
+Uso: python -m benchmarks.bench_update_table
+"""
+import os
+import tempfile
+
+import app
+from benchmarks.common import bench
+from benchmarks.synthetic import write_spread_csv
+
+# (bancos, anos) de cada tamanho de dataset: ~10 mil, ~100 mil e ~1 milhão de linhas
+SIZES = [(250, 10), (2500, 10), (25000, 10)]
+
+
+def apply_format(table):
+    """Formatação linha a linha usada antes pelo update_table"""
+    table['VOLUME_OP'] = table['VOLUME_OP'] / 1000000
+    table['VOLUME_INTERBANK'] = table['VOLUME_INTERBANK'] / 1000000
+    table['RESULT_OP'] = table['RESULT_OP'] / 1000000
+    table['VOLUME_OP'] = table['VOLUME_OP'].apply(lambda x: f"{x:.2f}Bi ")
+    table['VOLUME_INTERBANK'] = table['VOLUME_INTERBANK'].apply(lambda x: f"{x:.2f}Bi ")
+    table['RESULT_OP'] = table['RESULT_OP'].astype(object)
+    table.loc[table['RESULT_OP'] != 0, 'RESULT_OP'] \
+        = table['RESULT_OP'][table['RESULT_OP'] != 0].apply(lambda x: f"{x:.2f}Bi ")
+    return table.to_dict("records")
+
+
+def vectorized_format(table):
+    """Conversão vetorizada de todas as linhas (texto montado no navegador)"""
+    return app.format_table(table).to_dict("records")
+
+
+def page_format(df):
+    """Caminho do callback: ordena a seleção e formata só a página visível"""
+    order = app.table_order(df, app.TABLE_SORT_BY)
+    page = order[:app.TABLE_PAGE_SIZE]
+    return app.format_table(app.data_table(df.take(page))).to_dict("records")
+
+
+def main():
+    print(f"{'linhas':>10} {'apply (ms)':>12} {'vetorizado (ms)':>16} {'página (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_banks, n_years in SIZES:
+            path = write_spread_csv(os.path.join(tmp, "spread.csv"),
+                                    n_banks=n_banks, n_years=n_years)
+            df = app.read_csv(path)
+
+            applied = bench(lambda: apply_format(app.data_table(df)), repeat=3)
+            vectorized = bench(lambda: vectorized_format(app.data_table(df)), repeat=3)
+            paged = bench(lambda: page_format(df), repeat=3)
+            print(f"{len(df):>10} {applied:>12.1f} {vectorized:>16.1f} {paged:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
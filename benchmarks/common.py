@@ -0,0 +1,36 @@
+"""
+Funções comuns aos scripts de benchmark
+"""
+import json
+import subprocess
+import sys
+import timeit
+
+
+def bench(func, repeat=5, number=1, warmup=False):
+    """
+    Menor tempo médio (ms) de uma chamada de func, em repeat medições de number chamadas
+    Com warmup, func é chamada uma vez antes, sem medição (importações e caches sob demanda)
+    """
+    if warmup:
+        func()
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+
+def worker_output(args, env=None):
+    """
+    Executa python -m args em um novo processo e retorna o JSON da última linha da saída
+    (as linhas anteriores podem ser logs do app)
+    """
+    result = subprocess.run([sys.executable, "-m", *args], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def synchronous_figures(app):
+    """
+    Desativa os callbacks em segundo plano no módulo app: as figuras das seleções grandes
+    passam a ser criadas na própria requisição (sem isso, o update_selection apenas enviaria a
+    seleção ao build_figures, e as medições seriam só as da tabela)
+    """
+    app.background_manager = None
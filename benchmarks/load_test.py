@@ -0,0 +1,152 @@
+"""
+Teste de carga dos callbacks principais em um servidor já em execução
+
+Lê o layout e os callbacks do próprio servidor (/_dash-layout e /_dash-dependencies),
+monta as requisições com os valores iniciais dos componentes e mede as requisições
+por segundo e a latência de cada callback executado no servidor. Os callbacks em segundo
+plano e os que não alteram nada com os valores iniciais (resposta 204) ficam de fora.
+
+Uso:
+    gunicorn app:server &
+    python -m benchmarks.load_test [url] [--requests N] [--concurrency C]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def get_json(url):
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def component_values(layout, values=None):
+    """Valores iniciais (id, propriedade) -> valor de todos os componentes com id"""
+    values = {} if values is None else values
+    if isinstance(layout, dict):
+        props = layout.get("props", {})
+        if "id" in props:
+            for prop, value in props.items():
+                values[(props["id"], prop)] = value
+        for value in props.values():
+            component_values(value, values)
+    elif isinstance(layout, list):
+        for item in layout:
+            component_values(item, values)
+    return values
+
+
+def callback_requests(dependencies, values, background=True):
+    """
+    Corpo da requisição de cada callback executado no servidor
+    Com background=False, os callbacks em segundo plano ficam de fora
+    """
+    def dep(d):
+        return {"id": d["id"], "property": d["property"], "value": values.get((d["id"], d["property"]))}
+
+    requests = {}
+    for cb in dependencies:
+        # Callbacks executados no navegador não passam pelo servidor
+        if cb.get("clientside_function"):
+            continue
+        if cb.get("long") and not background:
+            continue
+
+        output = cb["output"]
+        if output.startswith(".."):
+            outputs = [dict(zip(("id", "property"), o.rsplit(".", 1)))
+                       for o in output.strip(".").split("...")]
+        else:
+            outputs = dict(zip(("id", "property"), output.rsplit(".", 1)))
+        inputs = [dep(d) for d in cb["inputs"]]
+        requests[output] = json.dumps({
+            "output": output,
+            "outputs": outputs,
+            "inputs": inputs,
+            "state": [dep(d) for d in cb["state"]],
+            "changedPropIds": [f"{d['id']}.{d['property']}" for d in inputs[:1]],
+        }).encode()
+    return requests
+
+
+def without_no_ops(requests, status):
+    """
+    Requisições medidas pelos benchmarks: as de requests (sem os callbacks em segundo plano,
+    cuja requisição apenas inicia o processo, que executaria sem uma seleção) exceto as que
+    não alteram nada com os valores usados e respondem 204 (o cancelamento dos callbacks em
+    segundo plano e o update_options com a versão atual dos dados)
+    status(body) envia uma requisição e retorna o código da resposta
+    """
+    return {output: body for output, body in requests.items() if status(body) != 204}
+
+
+def measured_requests(client, values):
+    """Corpo da requisição de cada callback medido, no servidor de teste do Flask"""
+    requests = callback_requests(client.get("/_dash-dependencies").get_json(), values,
+                                 background=False)
+    return without_no_ops(requests, lambda body: client.post(
+        "/_dash-update-component", data=body, content_type="application/json").status_code)
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    return time.perf_counter() - start, status
+
+
+def run(url, body, n_requests, concurrency):
+    """Requisições por segundo e latências (s) de n_requests chamadas com concurrency threads"""
+    lock = threading.Lock()
+    latencies = []
+
+    def call(_):
+        latency, status = post(url, body)
+        with lock:
+            latencies.append(latency)
+        return status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        statuses = list(pool.map(call, range(n_requests)))
+    elapsed = time.perf_counter() - start
+    return n_requests / elapsed, sorted(latencies), statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:8050")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    base = args.url.rstrip("/")
+    values = component_values(get_json(f"{base}/_dash-layout"))
+    url = f"{base}/_dash-update-component"
+    requests = without_no_ops(
+        callback_requests(get_json(f"{base}/_dash-dependencies"), values, background=False),
+        lambda body: post(url, body)[1])
+
+    print(f"{args.requests} requisições por callback, {args.concurrency} simultâneas")
+    print(f"{'callback':<60} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for output, body in requests.items():
+        rate, latencies, statuses = run(url, body, args.requests, args.concurrency)
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        errors = sum(status not in (200, 204) for status in statuses)
+        print(f"{output[:60]:<60} {rate:8.1f} {p50:8.1f} {p95:8.1f}"
+              + (f"  ({errors} erros)" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
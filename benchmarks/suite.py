@@ -0,0 +1,185 @@
+"""
+Suíte de desempenho do pipeline de dados e figuras do dashboard
+
+Gera datasets sintéticos com o formato do data/spread.csv em escalas de 10×, 100× e 1000×
+(bancos e trimestres) e mede, com os caches vazios, a leitura do CSV, a filtragem, a tabela,
+os gráficos e os callbacks completos (chamados pelo servidor Flask, sem navegador).
+
+Os tempos são gravados em benchmarks/results/<commit>.json; com --compare, cada etapa é
+comparada com um resultado anterior e as regressões acima de --threshold são destacadas.
+
+Uso:
+    python -m benchmarks.suite [--scales 10x,100x,1000x] [--compare benchmarks/results/<commit>.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly
+
+import app
+from benchmarks.load_test import component_values, measured_requests
+from benchmarks.synthetic import write_spread_csv
+
+# (bancos, anos) de cada escala, em relação ao tamanho do data/spread.csv (76 bancos, 3 anos)
+SCALES = {
+    "1x": (76, 3),
+    "10x": (760, 3),
+    "100x": (760, 30),
+    "1000x": (7600, 30),
+}
+
+# Repetições de cada medição por escala (o menor tempo e a mediana são gravados)
+REPEAT = {"1x": 7, "10x": 7, "100x": 5, "1000x": 3}
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def clear_caches():
+    app.selection_cache.clear()
+    app.figure_cache.clear()
+
+
+def measure(func, repeat):
+    """Menor tempo e mediana (ms) de uma chamada de func, com os caches vazios antes de cada uma"""
+    times = timeit.repeat(func, setup=clear_caches, repeat=repeat, number=1)
+    return {"min_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000}
+
+
+def pipeline_benchmarks(path, repeat):
+    """Tempos das funções do pipeline para o spread.csv em path"""
+    results = {"read_csv": measure(lambda: app.read_csv(path), repeat)}
+
+    df = app.read_csv(path)
+    data = app.Dataset(df, f"bench-{len(df)}")
+    app.swap_dataset(data)
+
+    # Seleção inicial do dashboard (todos os anos, os 4 trimestres e os principais bancos)
+    selection = app.default_selection(data)
+    year, quarter, bank = map(list, selection)
+    filtered_df = app.filter_data(year, quarter, bank, df, data.index)
+
+    results["filter_data"] = measure(
+        lambda: app.filter_data(year, quarter, bank, df, data.index), repeat)
+    results["update_table"] = measure(
+        lambda: app.table_page(selection, 0, app.TABLE_SORT_BY, data=data), repeat)
+    for mode in app.BARPLOT_MODES:
+        results[f"create_barplot[{mode}]"] = measure(
+            lambda: app.create_barplot(data.cube.bank_rows(selection, "BB"),
+                                       data.cube.market_totals(selection), mode),
+            repeat)
+    results["update_pieplot"] = measure(
+        lambda: app.update_pieplot(filtered_df, data.cube.bank_totals(selection)), repeat)
+    results["update_lineplot"] = measure(lambda: app.update_lineplot(filtered_df), repeat)
+    results["update_spread_lineplot"] = measure(
+        lambda: app.update_spread_lineplot(filtered_df), repeat)
+    return len(df), results
+
+
+def callback_benchmarks(repeat):
+    """
+    Tempos dos callbacks completos (corpo do callback e serialização da resposta), sem os
+    callbacks em segundo plano e os que não alteram nada (ver measured_requests)
+    """
+    client = app.server.test_client()
+    values = component_values(client.get("/_dash-layout").get_json())
+    requests = measured_requests(client, values)
+
+    results = {}
+    for output, body in requests.items():
+        def call():
+            response = client.post("/_dash-update-component", data=body,
+                                   content_type="application/json")
+            assert response.status_code in (200, 204), response.status_code
+
+        # Nome da função do callback (ex.: update_table)
+        name = app.app.callback_map[output]["callback"].__name__
+        results[f"callback:{name}"] = measure(call, repeat)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, universal_newlines=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, previous, threshold):
+    """Imprime a razão entre os tempos atuais e os de um resultado anterior"""
+    print(f"\nComparação com {previous['commit']} (regressão acima de {threshold:.0%}):")
+    print(f"{'escala':>6} {'etapa':<45} {'antes (ms)':>10} {'agora (ms)':>10} {'razão':>7}")
+    for scale, scale_results in current["scales"].items():
+        before = previous["scales"].get(scale, {}).get("timings", {})
+        for name, timing in scale_results["timings"].items():
+            if name not in before:
+                continue
+            ratio = timing["min_ms"] / before[name]["min_ms"]
+            flag = "  <-- regressão" if ratio > 1 + threshold else ""
+            print(f"{scale:>6} {name:<45} {before[name]['min_ms']:>10.2f} "
+                  f"{timing['min_ms']:>10.2f} {ratio:>6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default="10x,100x,1000x",
+                        help=f"escalas separadas por vírgula ({', '.join(SCALES)})")
+    parser.add_argument("--output", default=RESULTS_DIR, help="pasta dos resultados")
+    parser.add_argument("--compare", help="resultado anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="aumento relativo do tempo considerado regressão")
+    args = parser.parse_args()
+
+    original = app.dataset
+    results = {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plotly": plotly.__version__,
+        "machine": platform.platform(),
+        "scales": {},
+    }
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for scale in args.scales.split(","):
+                n_banks, n_years = SCALES[scale]
+                path = write_spread_csv(os.path.join(tmp, f"spread_{scale}.csv"),
+                                        n_banks=n_banks, n_years=n_years)
+                n_rows, timings = pipeline_benchmarks(path, REPEAT[scale])
+                timings.update(callback_benchmarks(REPEAT[scale]))
+                results["scales"][scale] = {"rows": n_rows, "timings": timings}
+
+                print(f"\n{scale} ({n_rows} linhas)")
+                print(f"{'etapa':<45} {'mín (ms)':>10} {'mediana (ms)':>13}")
+                for name, timing in timings.items():
+                    print(f"{name:<45} {timing['min_ms']:>10.2f} {timing['median_ms']:>13.2f}")
+    finally:
+        app.swap_dataset(original)
+
+    os.makedirs(args.output, exist_ok=True)
+    output = os.path.join(args.output, f"{results['commit']}.json")
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResultados gravados em {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Geração de dados sintéticos no mesmo formato do data/spread.csv
+"""
+import numpy as np
+import pandas as pd
+
+# Principais bancos, sempre presentes para que as seleções padrão encontrem dados
+MAIN_BANKS = ["BB", "ITAU", "BRADESCO", "SANTANDER"]
+
+
+def make_spread_frame(n_banks=76, n_years=3, first_year=2020, seed=0):
+    """
+    Cria um dataFrame com as colunas brutas do spread.csv
+    (uma linha por banco, ano e trimestre)
+    """
+    rng = np.random.default_rng(seed)
+
+    # Lista de bancos: os principais mais bancos fictícios até completar n_banks
+    banks = MAIN_BANKS + [f"BANCO {i:05d}" for i in range(max(n_banks - len(MAIN_BANKS), 0))]
+    years = np.arange(first_year, first_year + n_years)
+    quarters = np.arange(1, 5)
+
+    # Produto cartesiano entre bancos, anos e trimestres
+    bank_col = np.repeat(banks, len(years) * len(quarters))
+    year_col = np.tile(np.repeat(years, len(quarters)), len(banks))
+    quarter_col = np.tile(quarters, len(banks) * len(years))
+    n = len(bank_col)
+
+    return pd.DataFrame({
+        "NOME_BANCO": bank_col,
+        "ANO": year_col,
+        "TRIMESTRE": quarter_col,
+        "NUMERO_OP": rng.integers(1, 1_400_000, n),
+        "VOLUME_OP": rng.integers(1_000, 72_000_000, n),
+        "NUMERO_INTERBANK": rng.integers(0, 40_000, n),
+        "VOLUME_INTERBANK": rng.integers(1_000, 87_000_000, n),
+        "RESULT_OP": rng.integers(0, 7_000_000, n),
+        "DESPESA_OP": -rng.integers(1, 700_000, n),
+    })
+
+
+def write_spread_csv(path, **kwargs):
+    """Grava um spread.csv sintético no caminho informado"""
+    make_spread_frame(**kwargs).to_csv(path, index=False)
+    return path
@@ -0,0 +1,55 @@
+"""
+Configuração do gunicorn para servir o dashboard em produção
+
+Uso: gunicorn app:server
+
+Os valores podem ser alterados pelas variáveis de ambiente abaixo, sem editar o arquivo.
+"""
+import gc
+import multiprocessing
+import os
+
+# Endereço e porta do servidor
+bind = os.environ.get("DASH_BIND", "0.0.0.0:8050")
+
+# Processos e threads por processo (os callbacks liberam o GIL em boa parte do pandas/numpy)
+workers = int(os.environ.get("DASH_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("DASH_THREADS", 4))
+worker_class = "gthread"
+
+# Tempo máximo (s) de uma requisição antes do worker ser reiniciado
+timeout = int(os.environ.get("DASH_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("DASH_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("DASH_KEEPALIVE", 5))
+
+# Carrega o app.py (e os dados) uma única vez, antes de criar os workers:
+# os workers compartilham a memória dos dados com o processo principal (copy-on-write)
+preload_app = True
+
+accesslog = os.environ.get("DASH_ACCESSLOG", None)
+loglevel = os.environ.get("DASH_LOGLEVEL", "info")
+
+
+def pre_fork(server, worker):
+    """Congela os objetos já carregados para o coletor de lixo não tocar nas suas páginas"""
+    if hasattr(gc, "freeze"):  # Python 3.7 ou mais recente
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    """
+    Inicia em cada worker a thread que recarrega os dados (threads não sobrevivem ao fork) e o
+    pool de figuras (DASH_FIGURE_PROCESSES), criado antes das threads
+    """
+    import app
+
+    app.start_figure_pool()
+    app.start_data_watcher()
+
+
+def child_exit(server, worker):
+    """Remove as métricas do worker encerrado (modo multiprocesso do prometheus_client)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,178 @@
+"""
+Testes das estruturas de dados do app.py
+
+Uso (na raiz do repositório, onde o app encontra o data/spread.csv): python -m pytest tests
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+from benchmarks.synthetic import MAIN_BANKS, write_spread_csv
+
+
+# Seleções (ano, trimestre, banco) que passam pelos dois caminhos do FilterIndex.positions:
+# poucas combinações (listas de posições) e muitas combinações (códigos categóricos)
+SELECTIONS = [
+    ([2021], ["06"], ["BB"]),
+    ([2020, 2022], ["03", "12"], MAIN_BANKS),
+    ([2020, 2021, 2022], ["03", "06", "09", "12"], MAIN_BANKS + ["BANCO 00010"]),
+    ([2021], ["03", "06", "09", "12"], None),
+    ([2021], ["06"], ["BANCO INEXISTENTE"]),
+    ([1999], ["06"], ["BB"]),
+    ([], ["06"], ["BB"]),
+]
+
+
+def read_synthetic(directory, name="spread.csv", **kwargs):
+    """Dados sintéticos lidos pelo app (80 bancos e 3 anos, 960 linhas, por padrão)"""
+    kwargs = {"n_banks": 80, "n_years": 3, **kwargs}
+    return app.read_csv(write_spread_csv(str(directory / name), **kwargs))
+
+
+def selection_lists(selection, banks):
+    """Seleção em listas (bank None = todos os bancos em banks)"""
+    year, quarter, bank = selection
+    return list(year), list(quarter), list(banks if bank is None else bank)
+
+
+@pytest.fixture(scope="module")
+def df(tmp_path_factory):
+    return read_synthetic(tmp_path_factory.mktemp("data"))
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_filter_index_matches_masks(df, selection):
+    year, quarter, bank = selection_lists(selection, df["NOME_BANCO"].unique())
+    expected = app.filter_data(year, quarter, bank, df, index=None)
+    result = app.filter_data(year, quarter, bank, df, app.FilterIndex(df))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_lru_cache_evicts_least_recently_used_by_bytes():
+    cache = app.LRUCache(10, len)
+    for key in "abc":
+        cache.get_or_create(key, lambda: "xxx")
+    assert cache.stats()["bytes"] == 9
+
+    # "a" passa a ser a mais recente: "b" é a primeira removida, depois "c"
+    assert cache.get_or_create("a", lambda: pytest.fail("valor recalculado")) == "xxx"
+    cache.get_or_create("d", lambda: "xxxx")
+    assert list(cache._data) == ["c", "a", "d"]
+    cache.get_or_create("e", lambda: "xx")
+    assert list(cache._data) == ["a", "d", "e"]
+    assert cache.stats() == {"hits": 1, "misses": 5, "entries": 3, "bytes": 9, "max_bytes": 10}
+
+
+def test_lru_cache_skips_values_larger_than_limit():
+    cache = app.LRUCache(10, len)
+    cache.get_or_create("a", lambda: "xxx")
+    assert cache.get_or_create("big", lambda: "x" * 11) == "x" * 11
+    assert list(cache._data) == ["a"]
+    assert cache.stats()["bytes"] == 3
+
+
+def test_lru_cache_computes_concurrent_misses_once():
+    cache = app.LRUCache(10, len)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "xxx"
+
+    threads = [threading.Thread(target=cache.get_or_create, args=("a", factory))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 3
+
+
+def split_synthetic(directory):
+    """Dados sintéticos de 2020 e 2021 e as linhas de 2022 incorporadas depois"""
+    old = read_synthetic(directory, "old.csv", n_years=2)
+    new = read_synthetic(directory, "new.csv", n_years=1, first_year=2022)
+    return old, new
+
+
+def test_filter_index_extend_matches_rebuild(tmp_path):
+    old, new = split_synthetic(tmp_path)
+    extended = app.FilterIndex(old).extend(new)
+    rebuilt = app.FilterIndex(pd.concat([old, new], ignore_index=True))
+
+    for selection in SELECTIONS:
+        year, quarter, bank = selection_lists(selection, new["NOME_BANCO"].unique())
+        np.testing.assert_array_equal(extended.positions(year, quarter, bank),
+                                      rebuilt.positions(year, quarter, bank))
+
+
+def test_dataset_append_matches_rebuild(tmp_path):
+    old, new = split_synthetic(tmp_path)
+    appended = app.Dataset(old, "test").append(new, "test+1")
+    rebuilt = app.Dataset(pd.concat([old, new], ignore_index=True), "test")
+
+    for selection in SELECTIONS:
+        year, quarter, bank = selection_lists(selection, rebuilt.banks)
+        result = app.filter_data(year, quarter, bank, appended.df, appended.index)
+        expected = app.filter_data(year, quarter, bank, rebuilt.df, rebuilt.index)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_cube_matches_groupby(df, selection):
+    year, quarter, bank = selection_lists(selection, df["NOME_BANCO"].unique())
+    filtered = app.filter_data(year, quarter, bank, df, app.FilterIndex(df))
+    normalized = app.normalize_selection(year, quarter, bank)
+    cube = app.Cube(df)
+
+    # Participação de cada banco
+    expected = filtered.groupby("NOME_BANCO")["TOTAL_N"].sum()
+    result = cube.bank_totals(normalized)
+    np.testing.assert_array_equal(result.index, expected.index)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+    # Totais do mercado por trimestre
+    expected = filtered.groupby("ANO-TRIMESTRE")[app.CUBE_MEASURES].sum().reset_index()
+    result = cube.market_totals(normalized)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    # Linhas de um banco (vazias se o banco não estiver na seleção ou nos dados)
+    expected = filtered.loc[filtered["NOME_BANCO"] == "BB",
+                            ["NOME_BANCO", "ANO-TRIMESTRE"] + app.CUBE_MEASURES]
+    expected = expected.sort_values("ANO-TRIMESTRE", kind="mergesort", ignore_index=True)
+    result = cube.bank_rows(normalized, "BB")
+    if expected.empty:
+        assert result.empty
+    else:
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert cube.bank_rows(normalized, "BANCO INEXISTENTE").empty
+
+
+def test_cube_extend_matches_rebuild(tmp_path):
+    old, new = split_synthetic(tmp_path)
+    extended = app.Cube(old).extend(new)
+    rebuilt = app.Cube(pd.concat([old, new], ignore_index=True))
+    np.testing.assert_array_equal(extended.values, rebuilt.values)
+    np.testing.assert_array_equal(extended.present, rebuilt.present)
+
+
+@pytest.mark.skipif(app.feather is None, reason="cache Feather requer pyarrow")
+def test_load_dataset_without_writable_cache(tmp_path, monkeypatch):
+    path = write_spread_csv(str(tmp_path / "spread.csv"), n_banks=10, n_years=1)
+
+    def read_only(df, file_path, **kwargs):
+        raise PermissionError(13, "Permission denied", file_path)
+
+    monkeypatch.setattr(app.feather, "write_feather", read_only)
+    pd.testing.assert_frame_equal(app.load_dataset(path), app.read_csv(path))
+    assert sorted(os.listdir(tmp_path)) == ["spread.csv"]
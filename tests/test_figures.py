@@ -0,0 +1,125 @@
+"""
+Testes das figuras: preparação dos dados dos gráficos e atualizações enviadas ao navegador
+
+Uso (na raiz do repositório, onde o app encontra o data/spread.csv): python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+from dash import Patch
+
+import app
+
+
+def bank_series(values):
+    """Série agregada por banco, como a de Cube.bank_totals"""
+    return pd.Series(values, name="TOTAL_N",
+                     index=pd.Index([f"B{i}" for i in range(len(values))], name="NOME_BANCO"))
+
+
+def test_top_n_keeps_largest_and_sums_the_rest():
+    result = app.top_n_with_remainder(bank_series([5, 30, 10, 20]), n=2)
+    assert result.to_dict() == {"B1": 30, "B3": 20, "Outros": 15}
+    assert result.name == "TOTAL_N" and result.index.name == "NOME_BANCO"
+
+
+def test_top_n_ties_keep_the_first_in_order():
+    result = app.top_n_with_remainder(bank_series([10, 20, 10, 10]), n=2)
+    assert result.to_dict() == {"B0": 10, "B1": 20, "Outros": 20}
+
+
+def test_top_n_with_n_above_the_number_of_entries():
+    values = bank_series([5, 30, 10])
+    pd.testing.assert_series_equal(app.top_n_with_remainder(values, n=3), values)
+    pd.testing.assert_series_equal(app.top_n_with_remainder(values, n=10), values)
+
+
+def test_top_n_min_share_groups_small_entries():
+    result = app.top_n_with_remainder(bank_series([1, 60, 39]), min_share=0.05)
+    assert result.to_dict() == {"B1": 60, "B2": 39, "Outros": 1}
+
+
+def test_top_n_all_zero_remainder():
+    # As entradas agrupadas somam zero: o resto aparece com zero
+    result = app.top_n_with_remainder(bank_series([10, 0, 0]), n=1)
+    assert result.to_dict() == {"B0": 10, "Outros": 0}
+
+    # Total zero: nenhuma entrada é agrupada pela participação mínima
+    values = bank_series([0, 0, 0])
+    pd.testing.assert_series_equal(app.top_n_with_remainder(values, min_share=0.05), values)
+
+
+def line_frame(n_points, banks=("BB", "ITAU"), seed=0):
+    """Linhas de resultado por banco com n_points datas cada, com as linhas fora de ordem"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=n_points, freq="D")
+    df = pd.DataFrame({
+        "NOME_BANCO": np.repeat(banks, n_points),
+        "ANO-TRIMESTRE": np.tile(dates, len(banks)),
+        "TOTAL_OP": rng.normal(size=n_points * len(banks)).cumsum(),
+    })
+    return df.sample(frac=1, random_state=seed)
+
+
+def test_downsample_short_series_pass_through():
+    df = line_frame(50)
+    assert app.downsample_lines(df, "TOTAL_OP", max_points=100) is df
+
+
+def test_downsample_keeps_endpoints_and_extremes():
+    df = line_frame(2000)
+    result = app.downsample_lines(df, "TOTAL_OP", max_points=200)
+    assert len(result) < len(df) / 4
+
+    for bank, line in df.groupby("NOME_BANCO"):
+        kept = result[result["NOME_BANCO"] == bank]
+        # Cada linha segue em ordem de x, com o primeiro e o último ponto
+        assert kept["ANO-TRIMESTRE"].is_monotonic_increasing
+        assert kept["ANO-TRIMESTRE"].iloc[0] == line["ANO-TRIMESTRE"].min()
+        assert kept["ANO-TRIMESTRE"].iloc[-1] == line["ANO-TRIMESTRE"].max()
+        # O pico e o vale da linha são mantidos
+        assert kept["TOTAL_OP"].max() == line["TOTAL_OP"].max()
+        assert kept["TOTAL_OP"].min() == line["TOTAL_OP"].min()
+
+    # As linhas seguem na ordem em que aparecem em df
+    assert list(dict.fromkeys(result["NOME_BANCO"])) == list(dict.fromkeys(df["NOME_BANCO"]))
+
+
+def test_figure_update_sends_patch_only_for_shown_layout():
+    figure = {"data": [{"y": [1, 2]}], "layout": {"title": {"text": "Spread"}}}
+    layouts = {}
+    assert app.figure_update(figure, "spread_lineplot", layouts) is figure
+    assert layouts == {"spread_lineplot": app.layout_hash(figure)}
+
+    # Mesmo layout já exibido: apenas os traços são substituídos
+    patch = app.figure_update(figure, "spread_lineplot", layouts)
+    assert isinstance(patch, Patch)
+    assert patch.to_plotly_json()["operations"] == [
+        {"operation": "Assign", "location": ["data"], "params": {"value": figure["data"]}}]
+
+    # Layout diferente: figura completa
+    changed = {"data": figure["data"], "layout": {"title": {"text": "Outro"}}}
+    assert app.figure_update(changed, "spread_lineplot", layouts) is changed
+
+
+def test_update_selection_patches_figures_already_shown():
+    data = app.dataset
+    selection = ([int(max(data.years))], ["03", "06", "09", "12"], ["BB", "ITAU"])
+
+    # Primeira exibição: figuras completas e os hashes dos seus layouts
+    first = app.update_selection(*selection, data.version, None, 0, app.TABLE_PAGE_SIZE, None)
+    barplots, figures, layouts = first[3], first[4:7], first[7]
+    assert set(barplots) == set(app.BARPLOT_MODES)
+    assert all("layout" in figure for figure in list(barplots.values()) + list(figures))
+    assert len(layouts) == len(app.BARPLOT_MODES) + 3
+
+    # Mesma seleção com os layouts exibidos: apenas Patches dos traços
+    second = app.update_selection(*selection, data.version, None, 0, app.TABLE_PAGE_SIZE,
+                                  layouts)
+    assert all(isinstance(update, Patch) for update in second[3:7])
+    assert second[7] == layouts
+
+    # Layout exibido diferente: a figura volta a ser enviada completa
+    stale = dict(layouts, pieplot="outro")
+    third = app.update_selection(*selection, data.version, None, 0, app.TABLE_PAGE_SIZE, stale)
+    assert not isinstance(third[4], Patch) and "layout" in third[4]
+    assert third[7] == layouts
@@ -0,0 +1,111 @@
+"""
+Testes da incorporação de novos trimestres (validate_quarter, ingest_quarter e
+ingest_incoming)
+
+Uso (na raiz do repositório, onde o app encontra o data/spread.csv): python -m pytest tests
+"""
+import pytest
+
+import app
+from benchmarks.synthetic import make_spread_frame, write_spread_csv
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    """Dataset atual com 2020 e 2021 (os trimestres de 2022 são os novos)"""
+    path = write_spread_csv(str(tmp_path / "spread.csv"), n_banks=10, n_years=2)
+    data = app.Dataset(app.read_csv(path), "test-ingest")
+    monkeypatch.setattr(app, "dataset", data)
+    monkeypatch.setattr(app, "rejected_sources", set())
+    return data
+
+
+@pytest.fixture
+def raw():
+    """Linhas brutas do primeiro trimestre de 2022"""
+    raw = make_spread_frame(n_banks=10, n_years=1, first_year=2022)
+    return raw[raw["TRIMESTRE"] == 1].reset_index(drop=True)
+
+
+def test_valid_quarter_is_ingested(data, raw):
+    ingested = app.ingest_quarter(raw)
+    assert app.dataset is ingested
+    assert len(ingested.df) == len(data.df) + len(raw)
+    assert ingested.version.startswith("test-ingest+")
+    assert len(app.filter_data([2022], ["03"], list(ingested.banks),
+                               ingested.df, ingested.index)) == len(raw)
+
+
+def test_missing_columns(data, raw):
+    with pytest.raises(ValueError, match="colunas ausentes: DESPESA_OP"):
+        app.validate_quarter(raw.drop(columns="DESPESA_OP"), data)
+
+
+def test_empty_file(data, raw):
+    with pytest.raises(ValueError, match="nenhuma linha"):
+        app.validate_quarter(raw.iloc[:0], data)
+
+
+def test_empty_values(data, raw):
+    raw.loc[0, "VOLUME_OP"] = None
+    with pytest.raises(ValueError, match="valores vazios"):
+        app.validate_quarter(raw, data)
+
+
+def test_not_numeric(data, raw):
+    raw["RESULT_OP"] = raw["RESULT_OP"].astype(str)
+    with pytest.raises(ValueError, match="colunas não numéricas: RESULT_OP"):
+        app.validate_quarter(raw, data)
+
+
+@pytest.mark.parametrize("quarter", [0, 5, 12])
+def test_bad_quarter(data, raw, quarter):
+    raw.loc[0, "TRIMESTRE"] = quarter
+    with pytest.raises(ValueError, match="trimestre fora do intervalo"):
+        app.validate_quarter(raw, data)
+
+
+def test_duplicate_bank_in_file(data, raw):
+    raw.loc[1, "NOME_BANCO"] = raw.loc[0, "NOME_BANCO"]
+    with pytest.raises(ValueError, match="banco repetido"):
+        app.validate_quarter(raw, data)
+
+
+def test_rows_already_in_dataset(data, raw):
+    raw["ANO"] = 2021
+    with pytest.raises(ValueError, match=f"{len(raw)} linhas já existem"):
+        app.validate_quarter(raw, data)
+
+
+def test_incoming_rejects_invalid_files(data, raw, tmp_path):
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    raw.to_csv(incoming / "2022-1.csv", index=False)
+    raw.assign(TRIMESTRE=5).to_csv(incoming / "2022-5.csv", index=False)
+
+    assert app.ingest_incoming(str(incoming)) == 1
+    assert len(app.dataset.df) == len(data.df) + len(raw)
+    assert [name for name, _, _ in app.dataset.sources] == ["2022-1.csv"]
+    assert [name for name, _, _ in app.rejected_sources] == ["2022-5.csv"]
+
+    # Os arquivos já incorporados ou rejeitados não são lidos de novo
+    assert app.ingest_incoming(str(incoming)) == 0
+
+
+def test_version_depends_only_on_ingested_sources(data, raw):
+    first, second = raw, raw.assign(TRIMESTRE=2)
+    sources = ("2022-1.csv", 1, 100), ("2022-2.csv", 1, 100)
+
+    # A mesma versão em qualquer ordem de incorporação (ex.: um worker reiniciado)
+    in_order = app.append_quarter(app.append_quarter(data, first, sources[0]),
+                                  second, sources[1])
+    reversed_order = app.append_quarter(app.append_quarter(data, second, sources[1]),
+                                        first, sources[0])
+    assert in_order.version == reversed_order.version
+    assert in_order.version.startswith("test-ingest+")
+
+    # Linhas sem arquivo: a versão depende do conteúdo
+    assert app.append_quarter(data, first).version == app.append_quarter(data, first).version
+    assert app.append_quarter(data, first).version != app.append_quarter(data, second).version
+    assert app.append_quarter(data, first).version != app.append_quarter(
+        data, first, sources[0]).version
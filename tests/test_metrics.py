@@ -0,0 +1,21 @@
+"""
+Testes das métricas expostas em /metrics
+
+Uso (na raiz do repositório, onde o app encontra o data/spread.csv): python -m pytest tests
+"""
+import app
+
+
+def test_metrics_single_process(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    response = app.server.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert b"dash_worker_memory_bytes" in response.data
+
+
+def test_metrics_with_multiprocess_dir(tmp_path, monkeypatch):
+    # Configuração do gunicorn.conf.py: as métricas de todos os workers são somadas
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    response = app.server.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
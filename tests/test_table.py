@@ -0,0 +1,68 @@
+"""
+Testes da paginação e da ordenação do DataTable feitas no servidor
+
+Uso (na raiz do repositório, onde o app encontra o data/spread.csv): python -m pytest tests
+"""
+import numpy as np
+import pandas as pd
+
+import app
+from benchmarks.synthetic import write_spread_csv
+
+
+def test_table_order_multiple_columns():
+    df = pd.DataFrame({"NOME_BANCO": ["B", "A", "B", "A"], "VOLUME_OP": [1, 2, 3, 4]})
+    order = app.table_order(df, [{"column_id": "NOME_BANCO", "direction": "asc"},
+                                 {"column_id": "VOLUME_OP", "direction": "desc"}])
+    np.testing.assert_array_equal(order, [3, 1, 2, 0])
+
+
+def test_table_order_descending_is_stable():
+    df = pd.DataFrame({"NOME_BANCO": ["A", "B", "C", "D"], "VOLUME_OP": [1, 2, 1, 2]})
+    order = app.table_order(df, [{"column_id": "VOLUME_OP", "direction": "desc"}])
+    np.testing.assert_array_equal(order, [1, 3, 0, 2])
+
+
+def test_table_order_ignores_hidden_columns():
+    df = pd.DataFrame({"NOME_BANCO": ["B", "A"], "TOTAL_N": [2, 1]})
+    np.testing.assert_array_equal(app.table_order(df, None), [0, 1])
+    np.testing.assert_array_equal(
+        app.table_order(df, [{"column_id": "TOTAL_N", "direction": "asc"}]), [0, 1])
+
+
+def test_page_past_the_end_is_clamped(tmp_path):
+    path = write_spread_csv(str(tmp_path / "spread.csv"), n_banks=4, n_years=1)
+    data = app.Dataset(app.read_csv(path), "test-table")
+    selection = app.normalize_selection([2020], ["03", "06", "09", "12"], ["BB", "ITAU"])
+    sort_by = [{"column_id": "VOLUME_OP", "direction": "desc"}]
+
+    # 2 bancos em 4 trimestres: 8 linhas em 3 páginas, a última com 2 linhas
+    records, page_count, page_current = app.table_page(selection, 1000, sort_by, 3, data)
+    assert (page_count, page_current) == (3, 2)
+    assert len(records) == 2
+
+    # As páginas seguem a ordenação pedida
+    pages = [app.table_page(selection, page, sort_by, 3, data)[0] for page in range(3)]
+    volumes = [record["VOLUME_OP"] for page in pages for record in page]
+    assert len(volumes) == 8 and volumes == sorted(volumes, reverse=True)
+
+
+def test_format_table_converts_to_billions():
+    table = pd.DataFrame({
+        "NOME_BANCO": ["BB", "ITAU"],
+        "ANO_TRIMESTRE": ["2022-03", "2022-06"],
+        "VOLUME_OP": [2_500_000, 1_000],
+        "VOLUME_INTERBANK": [0, 3_000_000],
+        "RESULT_OP": [0, -1_250_000],
+    })
+    result = app.format_table(table)
+
+    # Valores em bilhões (o texto "x.xxBi" é montado no navegador)
+    np.testing.assert_allclose(result["VOLUME_OP"], [2.5, 0.001])
+    np.testing.assert_allclose(result["VOLUME_INTERBANK"], [0.0, 3.0])
+    # Resultado igual a zero vira nulo (exibido como "0"); os demais são convertidos
+    assert np.isnan(result.loc[0, "RESULT_OP"])
+    assert result.loc[1, "RESULT_OP"] == -1.25
+    # As colunas de texto não mudam
+    assert result["NOME_BANCO"].tolist() == ["BB", "ITAU"]
+    assert result["ANO_TRIMESTRE"].tolist() == ["2022-03", "2022-06"]